@@ -5,13 +5,31 @@ from django.utils.html import format_html
 from django.urls import reverse, path
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.core.management import call_command
+from django.core.cache import cache
 from django.http import HttpResponseRedirect
 from django.utils import timezone
 from datetime import timedelta
-import threading
+import hashlib
 
-from .models import DataProfilingReport, DataQualityMetric, ReportGenerationLog
+from .models import Country, DataProfilingReport, DataQualityMetric, ReportGenerationLog
+from .tasks import generate_data_profile_task
+
+# How long an identical report request is rejected after being queued
+REPORT_REQUEST_LOCK_SECONDS = 600
+
+
+class CountryListFilter(admin.SimpleListFilter):
+    """Filter reports by an included country via array containment on the interned ids"""
+    title = 'country'
+    parameter_name = 'country'
+
+    def lookups(self, request, model_admin):
+        return Country.objects.values_list('id', 'code')
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(countries__contains=[int(self.value())])
+        return queryset
 
 
 class DataQualityMetricInline(admin.TabularInline):
@@ -21,6 +39,9 @@ class DataQualityMetricInline(admin.TabularInline):
     fields = ['metric_name', 'metric_category', 'metric_value', 'metric_unit', 'table_name', 'column_name',
               'is_within_threshold']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('report')
+
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -31,6 +52,9 @@ class ReportGenerationLogInline(admin.TabularInline):
     readonly_fields = ['requested_at', 'status', 'duration_display', 'error_message']
     fields = ['requested_at', 'status', 'duration_display', 'error_message']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('report')
+
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -52,10 +76,9 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
         'status',
         'report_type',
         ('generated_at', admin.DateFieldListFilter),
-        'countries'
+        CountryListFilter
     ]
 
-    search_fields = ['countries']
     date_hierarchy = 'generated_at'
     ordering = ['-generated_at']
 
@@ -64,6 +87,7 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
         'record_count',
         'generated_at',
         'analysis_period_days',
+        'countries_display',
         'file_size_mb',
         'view_report_link'
     ]
@@ -73,7 +97,7 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
             'fields': ('status', 'report_type', 'view_report_link')
         }),
         ('Analysis Scope', {
-            'fields': ('countries', 'start_date', 'end_date', 'analysis_period_days')
+            'fields': ('countries_display', 'start_date', 'end_date', 'analysis_period_days')
         }),
         ('Report Details', {
             'fields': ('record_count', 'file_size_mb', 'report_url')
@@ -96,12 +120,16 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
         ]
         return custom_urls + urls
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('generated_by')
+
     def countries_display_short(self, obj):
         if not obj.countries:
             return "All Countries"
-        if len(obj.countries) <= 3:
-            return ', '.join(obj.countries)
-        return f"{', '.join(obj.countries[:2])} +{len(obj.countries) - 2} more"
+        codes = obj.country_codes
+        if len(codes) <= 3:
+            return ', '.join(codes)
+        return f"{', '.join(codes[:2])} +{len(codes) - 2} more"
 
     countries_display_short.short_description = "Countries"
 
@@ -157,6 +185,16 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
             report_type = request.POST.get('report_type', 'minimal')
             sample_size = request.POST.get('sample_size', '50000')
 
+            # Debounce repeated submissions of the same report request
+            lock_params = '|'.join([countries, start_date or '', end_date or '', report_type, sample_size])
+            lock_key = f"generate_report:{hashlib.sha1(lock_params.encode()).hexdigest()}"
+            if not cache.add(lock_key, 1, timeout=REPORT_REQUEST_LOCK_SECONDS):
+                messages.warning(
+                    request,
+                    'An identical report is already being generated. Please wait for it to finish.'
+                )
+                return redirect('admin:analytics_dataprofilingreport_changelist')
+
             # Build command arguments
             cmd_args = [
                 '--report-type', report_type,
@@ -170,33 +208,31 @@ class DataProfilingReportAdmin(admin.ModelAdmin):
             if end_date:
                 cmd_args.extend(['--end-date', end_date])
 
-            # Create generation log
-            log = ReportGenerationLog.objects.create(
-                requested_by=request.user,
-                countries_requested=countries.split(',') if countries else [],
-                start_date_requested=timezone.now() - timedelta(days=30),
-                end_date_requested=timezone.now(),
-                report_type_requested=report_type,
-                started_at=timezone.now()
-            )
-
-            # Start report generation in background
-            def generate_report_async():
-                try:
-                    call_command('generate_data_profile', *cmd_args)
-                    log.status = ReportGenerationLog.SUCCESS
-                    log.completed_at = timezone.now()
-                    log.save()
-                except Exception as e:
-                    log.status = ReportGenerationLog.FAILED
-                    log.error_message = str(e)
-                    log.completed_at = timezone.now()
-                    log.save()
-
-            # Start background thread
-            thread = threading.Thread(target=generate_report_async)
-            thread.daemon = True
-            thread.start()
+            log = None
+            try:
+                # Create generation log
+                log = ReportGenerationLog.objects.create(
+                    requested_by=request.user,
+                    countries_requested=Country.ids_for_codes(countries.split(',')) if countries else [],
+                    start_date_requested=timezone.now() - timedelta(days=30),
+                    end_date_requested=timezone.now(),
+                    report_type_requested=report_type,
+                    started_at=timezone.now()
+                )
+
+                # Queue report generation on a Celery worker, which releases the lock when done
+                generate_data_profile_task.delay(log.id, cmd_args, lock_key)
+            except Exception as e:
+                # Nothing was queued, so don't hold the lock or leave the log pending
+                cache.delete(lock_key)
+                if log is not None:
+                    ReportGenerationLog.objects.filter(id=log.id).update(
+                        status=ReportGenerationLog.FAILED,
+                        error_message=f'Could not queue report generation: {e}',
+                        completed_at=timezone.now()
+                    )
+                messages.error(request, f'Report generation could not be started: {e}')
+                return redirect('admin:analytics_dataprofilingreport_changelist')
 
             messages.success(
                 request,
@@ -235,6 +271,9 @@ class DataQualityMetricAdmin(admin.ModelAdmin):
     search_fields = ['metric_name', 'table_name', 'column_name']
     ordering = ['-report__generated_at', 'metric_category', 'metric_name']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('report')
+
     def report_link(self, obj):
         url = reverse('admin:analytics_dataprofilingreport_change', args=[obj.report.pk])
         return format_html('<a href="{}">{}</a>', url, obj.report.id)
@@ -277,20 +316,41 @@ class ReportGenerationLogAdmin(admin.ModelAdmin):
         ('requested_at', admin.DateFieldListFilter)
     ]
 
-    search_fields = ['requested_by__username', 'countries_requested']
+    search_fields = ['requested_by__username']
     date_hierarchy = 'requested_at'
     ordering = ['-requested_at']
 
     readonly_fields = [
-        'requested_at', 'started_at', 'completed_at',
+        'requested_at', 'countries_requested_display', 'started_at', 'completed_at',
         'data_extraction_seconds', 'report_generation_seconds',
         'upload_seconds', 'total_seconds'
     ]
 
+    # countries_requested holds Country ids, so the form shows the codes read-only
+    # instead of the raw id array
+    fieldsets = (
+        ('Request', {
+            'fields': ('requested_by', 'requested_at', 'report_type_requested')
+        }),
+        ('Analysis Scope', {
+            'fields': ('countries_requested_display', 'start_date_requested', 'end_date_requested')
+        }),
+        ('Result', {
+            'fields': ('status', 'report', 'error_message', 'started_at', 'completed_at')
+        }),
+        ('Performance', {
+            'fields': ('data_extraction_seconds', 'report_generation_seconds', 'upload_seconds', 'total_seconds'),
+            'classes': ('collapse',)
+        })
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('report', 'requested_by')
+
     def countries_requested_display(self, obj):
         if not obj.countries_requested:
             return "All Countries"
-        return ', '.join(obj.countries_requested)
+        return ', '.join(obj.countries_requested_codes)
 
     countries_requested_display.short_description = "Countries"
 
@@ -1,21 +1,64 @@
 # analytics/management/commands/generate_data_profile.py
 
+import numpy as np
 import pandas as pd
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, QuerySet
+from django.db.models.functions import Random
 from django.utils import timezone
 from ydata_profiling import ProfileReport
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
+import gzip
+import hashlib
+import json
 import os
+import shutil
 import tempfile
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import IO, Optional, List
 
 from energy_data.models import LoadData, RenewableGeneration, EnergyPrice
 from weather.models import WeatherData
-from analytics.models import DataProfilingReport
+from analytics.models import Country, DataProfilingReport, DataQualityMetric, ReportGenerationLog
+
+GENERATION_VALUE_COLUMNS = ['actual_generation_mw', 'capacity_mw', 'capacity_factor']
+WEATHER_VALUE_COLUMNS = [
+    'temperature_celsius', 'solar_irradiance_wm2', 'humidity_percent', 'wind_speed_ms', 'pressure_hpa'
+]
+PRICE_VALUE_COLUMNS = ['day_ahead_price', 'currency']
+
+# Explorative reports render pairwise correlation/interaction plots, so they
+# are profiled on a stratified subsample of at most this many rows
+EXPLORATIVE_SAMPLE_SIZE = 5000
+
+# Reports generated with identical parameters within this window are reused
+REPORT_CACHE_TTL = timedelta(hours=1)
+
+MB = 1024 * 1024
+REPORT_SPOOL_MAX_SIZE = 256 * MB
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=16 * MB,
+    max_concurrency=10,
+    use_threads=True
+)
+
+
+_default_superuser_id = None
+
+
+def default_superuser_id() -> Optional[int]:
+    """ID of the superuser reports are attributed to, cached once one exists"""
+    global _default_superuser_id
+    # A miss isn't cached, so a superuser created later is still picked up
+    if _default_superuser_id is None:
+        _default_superuser_id = User.objects.filter(is_superuser=True).values_list('id', flat=True).first()
+    return _default_superuser_id
 
 
 class Command(BaseCommand):
@@ -48,7 +91,17 @@ class Command(BaseCommand):
             '--sample-size',
             type=int,
             default=50000,
-            help='Maximum number of records to sample for profiling (default: 50000)'
+            help='Maximum number of load records to sample at random for profiling (default: 50000)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Generate a new report even if an identical one was generated recently'
+        )
+        parser.add_argument(
+            '--log-id',
+            type=int,
+            help='ID of the ReportGenerationLog to mark as completed with the generated report'
         )
 
     def handle(self, *args, **options):
@@ -64,6 +117,22 @@ class Command(BaseCommand):
             self.stdout.write(f'  Date range: {start_date} to {end_date}')
             self.stdout.write(f'  Sample size: {options["sample_size"]:,}')
 
+            params_hash = self.compute_params_hash(
+                countries, start_date, end_date, options['report_type'], options['sample_size']
+            )
+            if not options['force']:
+                cached_report = DataProfilingReport.objects.filter(
+                    params_hash=params_hash,
+                    status='completed',
+                    generated_at__gte=timezone.now() - REPORT_CACHE_TTL
+                ).first()
+                if cached_report:
+                    self.link_generation_log(options.get('log_id'), cached_report)
+                    self.stdout.write(
+                        self.style.SUCCESS(f'Reusing recent identical report: {cached_report.report_url}')
+                    )
+                    return
+
             # Extract and combine data
             combined_df = self.extract_combined_data(
                 countries, start_date, end_date, options['sample_size']
@@ -75,16 +144,21 @@ class Command(BaseCommand):
             self.stdout.write(f'Extracted {len(combined_df):,} records for profiling')
 
             # Generate profiling report
-            report_path = self.generate_profile_report(
+            report_file = self.generate_profile_report(
                 combined_df, options['report_type']
             )
 
             # Upload to S3
-            s3_url = self.upload_to_s3(report_path)
+            try:
+                s3_url = self.upload_to_s3(report_file)
+            finally:
+                report_file.close()
 
             # Save report metadata to database
             self.save_report_metadata(
-                s3_url, countries, start_date, end_date, len(combined_df)
+                s3_url, countries, start_date, end_date, len(combined_df),
+                report_type=options['report_type'], params_hash=params_hash,
+                log_id=options.get('log_id')
             )
 
             self.stdout.write(
@@ -103,6 +177,18 @@ class Command(BaseCommand):
             return [c.strip().upper() for c in countries_str.split(',')]
         return None
 
+    def compute_params_hash(self, countries: Optional[List[str]], start_date: datetime,
+                            end_date: datetime, report_type: str, sample_size: int) -> str:
+        """Hash the parameters that determine a report's content"""
+        params = {
+            'countries': sorted(countries) if countries else None,
+            'start_date': str(start_date),
+            'end_date': str(end_date),
+            'report_type': report_type,
+            'sample_size': sample_size,
+        }
+        return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
     def parse_date_range(self, options: dict) -> tuple:
         """Parse and validate date range"""
         end_date = options.get('end_date')
@@ -110,8 +196,7 @@ class Command(BaseCommand):
             end_date = pd.to_datetime(end_date, utc=True)
         else:
             # Default to latest data
-            latest_load = LoadData.objects.order_by('-utc_timestamp').first()
-            end_date = latest_load.utc_timestamp if latest_load else timezone.now()
+            end_date = LoadData.objects.aggregate(latest=Max('utc_timestamp'))['latest'] or timezone.now()
 
         start_date = options.get('start_date')
         if start_date:
@@ -122,6 +207,13 @@ class Command(BaseCommand):
 
         return start_date, end_date
 
+    def sample_queryset(self, queryset: QuerySet, sample_size: int) -> QuerySet:
+        """Randomly sample at most sample_size rows in a single pass over the range"""
+        # LIMIT over ORDER BY random() is a top-N heapsort: every row in the range is
+        # scanned once and only sample_size of them are held, so nothing is counted or
+        # fully sorted and the scan can't stop early in favour of the first partitions
+        return queryset.order_by(Random())[:sample_size]
+
     def extract_combined_data(self, countries: Optional[List[str]],
                               start_date: datetime, end_date: datetime,
                               sample_size: int) -> pd.DataFrame:
@@ -138,123 +230,73 @@ class Command(BaseCommand):
             load_filters['country_code__in'] = countries
 
         # Extract load data
-        load_queryset = LoadData.objects.filter(**load_filters).order_by('?')[:sample_size]
-        load_data = []
-
-        for load in load_queryset:
-            load_data.append({
-                'timestamp': load.utc_timestamp,
-                'country_code': load.country_code,
-                'actual_load_mw': load.actual_load_mw,
-                'forecast_load_mw': load.forecast_load_mw,
-            })
-
-        if not load_data:
-            return pd.DataFrame()
-
-        load_df = pd.DataFrame(load_data)
-        self.stdout.write(f'Extracted {len(load_df)} load records')
-
-        # Extract renewable generation data
-        self.stdout.write('Extracting renewable generation data...')
-        gen_filters = load_filters.copy()
-        gen_queryset = RenewableGeneration.objects.filter(**gen_filters)
-
-        gen_data = []
-        for gen in gen_queryset:
-            gen_data.append({
-                'timestamp': gen.utc_timestamp,
-                'country_code': gen.country_code,
-                'generation_type': gen.generation_type,
-                'actual_generation_mw': gen.actual_generation_mw,
-                'capacity_mw': gen.capacity_mw,
-                'capacity_factor': gen.capacity_factor,
-            })
-
-        # Pivot generation data
-        if gen_data:
-            gen_df = pd.DataFrame(gen_data)
-            gen_pivot = gen_df.pivot_table(
-                index=['timestamp', 'country_code'],
-                columns='generation_type',
-                values=['actual_generation_mw', 'capacity_mw', 'capacity_factor'],
-                aggfunc='first'
-            )
-            gen_pivot.columns = [f'{col[1]}_{col[0]}' for col in gen_pivot.columns]
-            gen_pivot = gen_pivot.reset_index()
-        else:
-            gen_pivot = pd.DataFrame(columns=['timestamp', 'country_code'])
-
-        # Extract weather data
-        self.stdout.write('Extracting weather data...')
-        weather_filters = {
-            'timestamp__gte': start_date,
-            'timestamp__lte': end_date
-        }
-        if countries:
-            weather_filters['country_code__in'] = countries
-
-        weather_queryset = WeatherData.objects.filter(**weather_filters)
-        weather_data = []
-
-        for weather in weather_queryset:
-            weather_data.append({
-                'timestamp': weather.timestamp,
-                'country_code': weather.country_code,
-                'temperature_celsius': weather.temperature_celsius,
-                'solar_irradiance_wm2': weather.solar_irradiance_wm2,
-                'humidity_percent': weather.humidity_percent,
-                'wind_speed_ms': weather.wind_speed_ms,
-                'pressure_hpa': weather.pressure_hpa,
-            })
-
-        weather_df = pd.DataFrame(weather_data) if weather_data else pd.DataFrame(
-            columns=['timestamp', 'country_code']
+        load_queryset = self.sample_queryset(LoadData.objects.filter(**load_filters), sample_size)
+
+        # The join, pivot and merges all run in the database (PostgreSQL is the only backend)
+        combined_df = self._extract_combined_sql(load_queryset)
+        if combined_df.empty:
+            return combined_df
+        self.stdout.write(f'Extracted {len(combined_df)} load records')
+        return self.add_derived_features(combined_df)
+
+    def _extract_combined_sql(self, load_queryset: QuerySet) -> pd.DataFrame:
+        """Join, pivot and merge all datasets in a single PostgreSQL query"""
+        self.stdout.write('Joining datasets in the database...')
+
+        load_sql, params = load_queryset.values(
+            'utc_timestamp', 'country_code', 'actual_load_mw', 'forecast_load_mw'
+        ).query.sql_with_params()
+
+        gen_columns = [
+            (f'{gen_type}_{value}', value, gen_type)
+            for gen_type, _ in RenewableGeneration.GENERATION_TYPE_CHOICES
+            for value in GENERATION_VALUE_COLUMNS
+        ]
+        gen_pivot_sql = ',\n                '.join(
+            f"MAX(g.{value}) FILTER (WHERE g.generation_type = '{gen_type}') AS {name}"
+            for name, value, gen_type in gen_columns
         )
-
-        # Extract price data
-        self.stdout.write('Extracting price data...')
-        price_queryset = EnergyPrice.objects.filter(**load_filters)
-        price_data = []
-
-        for price in price_queryset:
-            price_data.append({
-                'timestamp': price.utc_timestamp,
-                'country_code': price.country_code,
-                'day_ahead_price': price.day_ahead_price,
-                'currency': price.currency,
-            })
-
-        price_df = pd.DataFrame(price_data) if price_data else pd.DataFrame(
-            columns=['timestamp', 'country_code']
+        select_sql = ', '.join(
+            [f'gen.{name}' for name, _, _ in gen_columns]
+            + [f'w.{col}' for col in WEATHER_VALUE_COLUMNS]
+            + [f'p.{col}' for col in PRICE_VALUE_COLUMNS]
         )
 
-        # Combine all datasets
-        self.stdout.write('Combining datasets...')
-        combined_df = load_df.copy()
-
-        # Merge generation data
-        if not gen_pivot.empty:
-            combined_df = combined_df.merge(
-                gen_pivot, on=['timestamp', 'country_code'], how='left'
+        # The sampled load CTE is referenced twice and uses random(), so
+        # PostgreSQL materializes it once and every join sees the same sample
+        sql = f"""
+            WITH load AS ({load_sql}),
+            gen AS (
+                SELECT g.utc_timestamp, g.country_code,
+                {gen_pivot_sql}
+                FROM {RenewableGeneration._meta.db_table} g
+                JOIN load l
+                  ON l.utc_timestamp = g.utc_timestamp AND l.country_code = g.country_code
+                GROUP BY g.utc_timestamp, g.country_code
             )
+            SELECT l.utc_timestamp AS "timestamp", l.country_code,
+                   l.actual_load_mw, l.forecast_load_mw, {select_sql}
+            FROM load l
+            LEFT JOIN gen
+              ON gen.utc_timestamp = l.utc_timestamp AND gen.country_code = l.country_code
+            LEFT JOIN {WeatherData._meta.db_table} w
+              ON w."timestamp" = l.utc_timestamp AND w.country_code = l.country_code
+            LEFT JOIN {EnergyPrice._meta.db_table} p
+              ON p.utc_timestamp = l.utc_timestamp AND p.country_code = l.country_code
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
 
-        # Merge weather data
-        if not weather_df.empty:
-            combined_df = combined_df.merge(
-                weather_df, on=['timestamp', 'country_code'], how='left'
-            )
-
-        # Merge price data
-        if not price_df.empty:
-            combined_df = combined_df.merge(
-                price_df, on=['timestamp', 'country_code'], how='left'
-            )
-
-        # Add derived features
-        combined_df = self.add_derived_features(combined_df)
+        if df.empty:
+            return pd.DataFrame()
 
-        return combined_df
+        # Only keep joined columns that have data in the sampled range
+        joined_columns = df.columns[4:]
+        empty_columns = joined_columns[df[joined_columns].isna().all().to_numpy()]
+        return df.drop(columns=empty_columns)
 
     def add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add derived features for better analysis"""
@@ -265,27 +307,45 @@ class Command(BaseCommand):
         df['hour'] = df['timestamp'].dt.hour
         df['day_of_week'] = df['timestamp'].dt.dayofweek
         df['month'] = df['timestamp'].dt.month
-        df['is_weekend'] = df['day_of_week'].isin([5, 6])
+        df['is_weekend'] = df['day_of_week'].to_numpy() >= 5
 
         # Load features
         if 'actual_load_mw' in df.columns and 'forecast_load_mw' in df.columns:
             df['forecast_error_mw'] = df['actual_load_mw'] - df['forecast_load_mw']
-            df['forecast_error_pct'] = (
-                    df['forecast_error_mw'] / df['actual_load_mw'] * 100
-            ).fillna(0)
+            df['forecast_error_pct'] = self.percentage(df['forecast_error_mw'], df['actual_load_mw'])
 
         # Renewable features
         renewable_cols = [col for col in df.columns if 'actual_generation_mw' in col]
         if renewable_cols:
             df['total_renewable_mw'] = df[renewable_cols].sum(axis=1)
             if 'actual_load_mw' in df.columns:
-                df['renewable_penetration_pct'] = (
-                        df['total_renewable_mw'] / df['actual_load_mw'] * 100
-                ).fillna(0)
+                df['renewable_penetration_pct'] = self.percentage(
+                    df['total_renewable_mw'], df['actual_load_mw']
+                )
 
         return df
 
-    def generate_profile_report(self, df: pd.DataFrame, report_type: str) -> str:
+    def percentage(self, numerator: pd.Series, denominator: pd.Series) -> np.ndarray:
+        """Compute numerator / denominator * 100, using 0 where undefined"""
+        num = numerator.to_numpy(dtype=np.float64)
+        den = denominator.to_numpy(dtype=np.float64)
+        valid = (den != 0) & ~np.isnan(num) & ~np.isnan(den)
+        result = np.divide(num, den, out=np.zeros_like(den), where=valid)
+        result *= 100.0
+        return result
+
+    def optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Downcast floats to float32 and low-cardinality strings to category"""
+        float_cols = df.select_dtypes('float64').columns
+        df[float_cols] = df[float_cols].astype('float32')
+
+        for col in ('country_code', 'currency'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        return df
+
+    def generate_profile_report(self, df: pd.DataFrame, report_type: str) -> IO[bytes]:
         """Generate ydata-profiling report"""
         self.stdout.write('Generating profiling report...')
 
@@ -313,6 +373,18 @@ class Command(BaseCommand):
 
         config = config_map.get(report_type, config_map['minimal'])
 
+        df = self.optimize_dtypes(df)
+
+        if config.get('explorative') and len(df) > EXPLORATIVE_SAMPLE_SIZE:
+            df = df.groupby('country_code', observed=True, group_keys=False).sample(
+                frac=EXPLORATIVE_SAMPLE_SIZE / len(df), random_state=0
+            )
+            self.stdout.write(f'Profiling a stratified sample of {len(df):,} records')
+            config = {
+                **config,
+                'plot': {'image_format': 'png', 'dpi': 72, 'correlation': {'cmap': 'RdBu'}},
+            }
+
         # Generate report
         profile = ProfileReport(
             df,
@@ -320,14 +392,14 @@ class Command(BaseCommand):
             progress_bar=False
         )
 
-        # Save to temporary file
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        temp_file = f'/tmp/energy_profile_{timestamp}.html'
-        profile.to_file(temp_file)
+        # Keep the rendered report in memory unless it is unusually large
+        report_file = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE)
+        report_file.write(profile.to_html().encode('utf-8'))
+        report_file.seek(0)
 
-        return temp_file
+        return report_file
 
-    def upload_to_s3(self, file_path: str) -> str:
+    def upload_to_s3(self, report_file: IO[bytes]) -> str:
         """Upload report to S3 and return URL"""
         self.stdout.write('Uploading report to S3...')
 
@@ -341,7 +413,7 @@ class Command(BaseCommand):
         missing_settings = [key for key, value in required_settings.items() if not value]
         if missing_settings:
             # Save report locally instead
-            local_path = self.save_report_locally(file_path)
+            local_path = self.save_report_locally(report_file)
             self.stdout.write(
                 self.style.WARNING(
                     f'Missing AWS settings: {", ".join(missing_settings)}. '
@@ -362,17 +434,22 @@ class Command(BaseCommand):
 
             # Generate S3 key
             timestamp = timezone.now().strftime('%Y/%m/%d')
-            filename = os.path.basename(file_path)
+            filename = f"energy_profile_{timezone.now().strftime('%Y%m%d_%H%M%S')}.html"
             s3_key = f'analytics/data-profiles/{timestamp}/{filename}'
             endpoint_url = settings.AWS_S3_ENDPOINT_URL
 
-            # Upload file
-            s3_client.upload_file(
-                file_path,
-                required_settings['AWS_STORAGE_BUCKET_NAME'],
-                s3_key,
-                ExtraArgs={'ContentType': 'text/html'}
-            )
+            # Upload gzip-compressed file with parallel multipart transfer
+            gzip_file = self.compress_report(report_file)
+            try:
+                s3_client.upload_fileobj(
+                    gzip_file,
+                    required_settings['AWS_STORAGE_BUCKET_NAME'],
+                    s3_key,
+                    ExtraArgs={'ContentType': 'text/html', 'ContentEncoding': 'gzip'},
+                    Config=S3_TRANSFER_CONFIG
+                )
+            finally:
+                gzip_file.close()
 
             expiration_seconds = getattr(settings, 'AWS_S3_URL_EXPIRATION_SECONDS', 604800)
 
@@ -401,14 +478,12 @@ class Command(BaseCommand):
                 else:
                     presigned_url = f'https://{bucket_name}.s3.amazonaws.com/{s3_key}'
 
-            # Clean up temp file
-            os.remove(file_path)
             self.stdout.write(f'Report uploaded successfully. URL: {presigned_url[:100]}...')
             return presigned_url
 
         except ClientError as e:
             # Fallback to local storage
-            local_path = self.save_report_locally(file_path)
+            local_path = self.save_report_locally(report_file)
             self.stdout.write(
                 self.style.WARNING(
                     f'S3 upload failed: {str(e)}. Report saved locally at: {local_path}'
@@ -417,7 +492,7 @@ class Command(BaseCommand):
             return local_path
         except Exception as e:
             # Fallback to local storage
-            local_path = self.save_report_locally(file_path)
+            local_path = self.save_report_locally(report_file)
             self.stdout.write(
                 self.style.WARNING(
                     f'Upload error: {str(e)}. Report saved locally at: {local_path}'
@@ -425,7 +500,16 @@ class Command(BaseCommand):
             )
             return local_path
 
-    def save_report_locally(self, temp_file_path: str) -> str:
+    def compress_report(self, report_file: IO[bytes]) -> IO[bytes]:
+        """Return a gzip-compressed copy of the report, rewound for reading"""
+        gzip_file = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE)
+        report_file.seek(0)
+        with gzip.GzipFile(fileobj=gzip_file, mode='wb', compresslevel=6) as gz:
+            shutil.copyfileobj(report_file, gz)
+        gzip_file.seek(0)
+        return gzip_file
+
+    def save_report_locally(self, report_file: IO[bytes]) -> str:
         """Save report to local media directory as fallback"""
         try:
             reports_dir = os.path.join(settings.MEDIA_ROOT, 'analytics', 'data-profiles')
@@ -435,28 +519,57 @@ class Command(BaseCommand):
             filename = f'energy_profile_{timestamp}.html'
             local_path = os.path.join(reports_dir, filename)
 
-            import shutil
-            shutil.move(temp_file_path, local_path)
+            report_file.seek(0)
+            with open(local_path, 'wb') as f_out:
+                shutil.copyfileobj(report_file, f_out)
 
             # Return relative URL
             relative_path = os.path.join('analytics', 'data-profiles', filename)
             return f'{settings.MEDIA_URL}{relative_path}' if hasattr(settings, 'MEDIA_URL') else local_path
 
         except Exception as e:
-            # Last resort - return temp file path
+            # Last resort - the report only exists in memory, so give up
             self.stdout.write(self.style.ERROR(f'Failed to save locally: {str(e)}'))
-            return temp_file_path
+            raise CommandError(f'Failed to save report locally: {str(e)}')
 
+    @transaction.atomic
     def save_report_metadata(self, s3_url: str, countries: Optional[List[str]],
                              start_date: datetime, end_date: datetime,
-                             record_count: int):
-        """Save report metadata to database"""
-        DataProfilingReport.objects.create(
+                             record_count: int, report_type: str = 'minimal',
+                             params_hash: str = '',
+                             metrics: Optional[List[dict]] = None,
+                             log_id: Optional[int] = None) -> DataProfilingReport:
+        """Save report metadata, quality metrics and generation log in one transaction"""
+        report = DataProfilingReport.objects.create(
             report_url=s3_url,
-            countries=countries or [],
+            countries=Country.ids_for_codes(countries) if countries else [],
             start_date=start_date,
             end_date=end_date,
             record_count=record_count,
+            report_type=report_type,
+            params_hash=params_hash,
             generated_at=timezone.now(),
-            generated_by=User.objects.filter(is_superuser=True).first(),
+            generated_by_id=default_superuser_id(),
+        )
+
+        if metrics:
+            DataQualityMetric.objects.bulk_create(
+                [DataQualityMetric(report=report, **metric) for metric in metrics],
+                batch_size=1000,
+                ignore_conflicts=True
+            )
+
+        self.link_generation_log(log_id, report)
+
+        return report
+
+    def link_generation_log(self, log_id: Optional[int], report: DataProfilingReport):
+        """Mark the requesting ReportGenerationLog as successful"""
+        if log_id is None:
+            return
+
+        ReportGenerationLog.objects.filter(id=log_id).update(
+            report=report,
+            status=ReportGenerationLog.SUCCESS,
+            completed_at=timezone.now()
         )
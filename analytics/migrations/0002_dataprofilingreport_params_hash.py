@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataprofilingreport',
+            name='params_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-1 of the generation parameters, used to reuse recent reports', max_length=40),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:56
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_dataprofilingreport_params_hash'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='dataqualitymetric',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='dataqualitymetric',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Cast(django.db.models.functions.text.MD5(django.db.models.functions.text.Concat('report_id', models.Value('|'), 'metric_name', models.Value('|'), 'table_name', models.Value('|'), 'column_name')), models.UUIDField()), name='dataqualitymetric_identity_uniq'),
+        ),
+    ]
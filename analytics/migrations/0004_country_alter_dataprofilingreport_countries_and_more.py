@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:02
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+ARRAY_FIELDS = [
+    ('DataProfilingReport', 'countries'),
+    ('ReportGenerationLog', 'countries_requested'),
+]
+
+
+def intern_countries(apps, schema_editor):
+    """Replace country codes with Country ids (still as text, cast by the AlterFields below)"""
+    Country = apps.get_model('analytics', 'Country')
+    ids_by_code = {}
+    for model_name, field in ARRAY_FIELDS:
+        model = apps.get_model('analytics', model_name)
+        for obj in model.objects.exclude(**{field: []}).only('id', field):
+            codes = [code.strip().upper() for code in getattr(obj, field)]
+            for code in codes:
+                if code not in ids_by_code:
+                    ids_by_code[code] = Country.objects.get_or_create(code=code)[0].id
+            setattr(obj, field, [str(ids_by_code[code]) for code in codes])
+            obj.save(update_fields=[field])
+
+
+def restore_country_codes(apps, schema_editor):
+    Country = apps.get_model('analytics', 'Country')
+    codes_by_id = {str(pk): code for pk, code in Country.objects.values_list('id', 'code')}
+    for model_name, field in ARRAY_FIELDS:
+        model = apps.get_model('analytics', model_name)
+        for obj in model.objects.exclude(**{field: []}).only('id', field):
+            setattr(obj, field, [codes_by_id.get(pk, pk) for pk in getattr(obj, field)])
+            obj.save(update_fields=[field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_alter_dataqualitymetric_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Country',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=10, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Countries',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.RunPython(intern_countries, restore_country_codes),
+        migrations.AlterField(
+            model_name='dataprofilingreport',
+            name='countries',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.SmallIntegerField(), blank=True, default=list, help_text='Interned ids (see Country) of the countries included in the report', size=None),
+        ),
+        migrations.AlterField(
+            model_name='reportgenerationlog',
+            name='countries_requested',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.SmallIntegerField(), blank=True, default=list, help_text='Interned ids (see Country) of the requested countries', size=None),
+        ),
+        migrations.AddIndex(
+            model_name='dataprofilingreport',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['countries'], name='analytics_d_countri_8bde3a_gin'),
+        ),
+    ]
@@ -1,8 +1,58 @@
 # analytics/models.py
 
+import functools
+from functools import cached_property
+from typing import Dict, Iterable, List
+
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import MD5, Cast, Concat
 from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+
+
+class Country(models.Model):
+    """Interned country codes; report country arrays store these small ids"""
+
+    id = models.SmallAutoField(primary_key=True)
+    code = models.CharField(max_length=10, unique=True)
+
+    class Meta:
+        ordering = ['code']
+        verbose_name_plural = "Countries"
+
+    def __str__(self):
+        return self.code
+
+    @classmethod
+    def ids_for_codes(cls, codes: Iterable[str]) -> List[int]:
+        """Intern country codes, creating unknown ones, and return their ids in order"""
+        codes = [code.strip().upper() for code in codes if code.strip()]
+        ids_by_code = {code: pk for pk, code in country_codes_by_id().items()}
+
+        missing = [code for code in dict.fromkeys(codes) if code not in ids_by_code]
+        if missing:
+            cls.objects.bulk_create([cls(code=code) for code in missing], ignore_conflicts=True)
+            country_codes_by_id.cache_clear()
+            ids_by_code.update(cls.objects.filter(code__in=missing).values_list('code', 'id'))
+
+        return [ids_by_code[code] for code in codes]
+
+    @classmethod
+    def codes_for_ids(cls, ids: Iterable[int]) -> List[str]:
+        """Resolve interned ids back to country codes"""
+        codes = country_codes_by_id()
+        if any(pk not in codes for pk in ids):
+            country_codes_by_id.cache_clear()
+            codes = country_codes_by_id()
+        return [codes.get(pk, str(pk)) for pk in ids]
+
+
+@functools.lru_cache(maxsize=1)
+def country_codes_by_id() -> Dict[int, str]:
+    """Process-wide map of interned country ids to codes"""
+    return dict(Country.objects.values_list('id', 'code'))
 
 
 class DataProfilingReport(models.Model):
@@ -22,10 +72,10 @@ class DataProfilingReport(models.Model):
 
     # Report parameters
     countries = ArrayField(
-        models.CharField(max_length=10),
+        models.SmallIntegerField(),
         default=list,
         blank=True,
-        help_text="List of country codes included in the report"
+        help_text="Interned ids (see Country) of the countries included in the report"
     )
     start_date = models.DateTimeField(
         help_text="Start date of data analysis period"
@@ -43,6 +93,12 @@ class DataProfilingReport(models.Model):
         default='minimal',
         help_text="Type of profiling report (minimal, full, explorative)"
     )
+    params_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        db_index=True,
+        help_text="SHA-1 of the generation parameters, used to reuse recent reports"
+    )
 
     # Metadata
     generated_at = models.DateTimeField(default=timezone.now)
@@ -71,24 +127,31 @@ class DataProfilingReport(models.Model):
         ordering = ['-generated_at']
         verbose_name = "Data Profiling Report"
         verbose_name_plural = "Data Profiling Reports"
+        indexes = [
+            GinIndex(fields=['countries']),
+        ]
 
     def __str__(self):
-        countries_str = ', '.join(self.countries) if self.countries else 'All Countries'
-        return f"Profile Report - {countries_str} ({self.generated_at.strftime('%Y-%m-%d %H:%M')})"
+        return f"Profile Report - {self.countries_display} ({self.generated_at.strftime('%Y-%m-%d %H:%M')})"
 
-    @property
+    @cached_property
     def analysis_period_days(self):
         """Calculate the umber of days covered in the analysis"""
         if self.end_date and self.start_date:
             return (self.end_date - self.start_date).days
         return None
 
-    @property
+    @cached_property
+    def country_codes(self):
+        """Country codes for the interned ids in countries"""
+        return Country.codes_for_ids(self.countries)
+
+    @cached_property
     def countries_display(self):
         """Human-readable country list"""
         if not self.countries:
             return "All Countries"
-        return ', '.join(self.countries)
+        return ', '.join(self.country_codes)
 
 
 class DataQualityMetric(models.Model):
@@ -146,8 +209,20 @@ class DataQualityMetric(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ['report', 'metric_name', 'table_name', 'column_name']
         ordering = ['metric_category', 'metric_name']
+        constraints = [
+            # One 16-byte hash key instead of a wide four-column B-tree
+            models.UniqueConstraint(
+                Cast(
+                    MD5(Concat(
+                        'report_id', Value('|'), 'metric_name', Value('|'),
+                        'table_name', Value('|'), 'column_name'
+                    )),
+                    models.UUIDField()
+                ),
+                name='dataqualitymetric_identity_uniq'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.metric_name}: {self.metric_value}{self.metric_unit}"
@@ -163,9 +238,10 @@ class ReportGenerationLog(models.Model):
     requested_at = models.DateTimeField(auto_now_add=True)
 
     countries_requested = ArrayField(
-        models.CharField(max_length=10),
+        models.SmallIntegerField(),
         default=list,
-        blank=True
+        blank=True,
+        help_text="Interned ids (see Country) of the requested countries"
     )
     start_date_requested = models.DateTimeField()
     end_date_requested = models.DateTimeField()
@@ -217,7 +293,12 @@ class ReportGenerationLog(models.Model):
     def __str__(self):
         return f"Report Generation - {self.status} ({self.requested_at.strftime('%Y-%m-%d %H:%M')})"
 
-    @property
+    @cached_property
+    def countries_requested_codes(self):
+        """Country codes for the interned ids in countries_requested"""
+        return Country.codes_for_ids(self.countries_requested)
+
+    @cached_property
     def duration_display(self):
         """Human-readable duration"""
         if self.total_seconds:
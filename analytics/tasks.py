@@ -0,0 +1,31 @@
+# analytics/tasks.py
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from analytics.models import ReportGenerationLog
+
+
+@shared_task(bind=True, max_retries=3)
+def generate_data_profile_task(self, log_id, cmd_args, lock_key=None):
+    """Run generate_data_profile for a log (the command records success, we record failures)"""
+    retrying = False
+    try:
+        call_command('generate_data_profile', *cmd_args, '--log-id', str(log_id))
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            retrying = True
+            raise self.retry(exc=e, countdown=60)
+
+        ReportGenerationLog.objects.filter(id=log_id).update(
+            status=ReportGenerationLog.FAILED,
+            error_message=str(e),
+            completed_at=timezone.now()
+        )
+        raise
+    finally:
+        # The admin's duplicate-request lock lasts until the report finishes or finally fails
+        if lock_key and not retrying:
+            cache.delete(lock_key)
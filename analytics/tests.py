@@ -1,3 +1,125 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from analytics.management.commands.generate_data_profile import Command as GenerateDataProfileCommand
+from analytics.models import Country, ReportGenerationLog, country_codes_by_id
+from analytics.tasks import generate_data_profile_task
+from energy_data.models import EnergyPrice, LoadData, RenewableGeneration
+
+
+def create_load_rows(count, country_code='DE'):
+    """Create count hourly LoadData rows for one country"""
+    start = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    return LoadData.objects.bulk_create([
+        LoadData(
+            utc_timestamp=start + timedelta(hours=i), cet_cest_timestamp=start + timedelta(hours=i),
+            country_code=country_code, actual_load_mw=1000 + i
+        )
+        for i in range(count)
+    ])
+
+
+class SampleQuerysetTests(TestCase):
+    def setUp(self):
+        create_load_rows(30)
+        self.command = GenerateDataProfileCommand()
+
+    def test_sample_is_capped_at_sample_size(self):
+        sample = list(self.command.sample_queryset(LoadData.objects.all(), 10).values_list('pk', flat=True))
+
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(len(set(sample)), 10)
+
+    def test_small_range_is_returned_whole(self):
+        sample = self.command.sample_queryset(LoadData.objects.filter(country_code='DE'), 50)
+
+        self.assertEqual(sample.count(), 30)
+
+
+class ExtractCombinedDataTests(TestCase):
+    def test_joins_generation_and_prices_onto_load_rows(self):
+        first_hour = create_load_rows(30)[0].utc_timestamp
+        RenewableGeneration.objects.create(
+            utc_timestamp=first_hour, cet_cest_timestamp=first_hour, country_code='DE',
+            generation_type='solar', actual_generation_mw=250, capacity_mw=1000, capacity_factor=0.25
+        )
+        EnergyPrice.objects.create(
+            utc_timestamp=first_hour, cet_cest_timestamp=first_hour, country_code='DE', day_ahead_price=40
+        )
+
+        df = GenerateDataProfileCommand(stdout=StringIO()).extract_combined_data(
+            ['DE'], first_hour, first_hour + timedelta(days=2), 50
+        )
+
+        self.assertEqual(len(df), 30)
+        # Joined columns without any data in the range are left out
+        self.assertNotIn('wind_onshore_actual_generation_mw', df.columns)
+        self.assertNotIn('temperature_celsius', df.columns)
+        row = df.set_index('timestamp').loc[first_hour]
+        self.assertEqual((row['solar_actual_generation_mw'], row['day_ahead_price']), (250, 40))
+        self.assertEqual(row['renewable_penetration_pct'], 25)
+
+
+class CountryTests(TestCase):
+    def setUp(self):
+        # The id map is process-wide and would outlive each test's rolled-back rows
+        country_codes_by_id.cache_clear()
+        self.addCleanup(country_codes_by_id.cache_clear)
+
+    def test_codes_are_interned_once_and_resolved_in_order(self):
+        ids = Country.ids_for_codes(['de', ' FR ', '', 'DE'])
+
+        self.assertEqual(Country.objects.count(), 2)
+        self.assertEqual(ids[0], ids[2])
+        self.assertEqual(Country.codes_for_ids(ids), ['DE', 'FR', 'DE'])
+        self.assertEqual(Country.ids_for_codes(['FR']), [ids[1]])
+
+    def test_codes_created_elsewhere_are_picked_up(self):
+        Country.ids_for_codes(['DE'])
+        country = Country.objects.create(code='NL')
+
+        self.assertEqual(Country.codes_for_ids([country.pk]), ['NL'])
+        self.assertEqual(Country.codes_for_ids([-1]), ['-1'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class GenerateDataProfileTaskTests(TestCase):
+    lock_key = 'generate_report:test'
+
+    def setUp(self):
+        self.log = ReportGenerationLog.objects.create(
+            start_date_requested=timezone.now() - timedelta(days=30),
+            end_date_requested=timezone.now(),
+            report_type_requested='minimal'
+        )
+        cache.add(self.lock_key, 1)
+
+    @mock.patch('analytics.tasks.call_command')
+    def test_lock_is_released_when_the_report_is_generated(self, call_command):
+        generate_data_profile_task.apply(args=(self.log.id, ['--force'], self.lock_key))
+
+        call_command.assert_called_once_with('generate_data_profile', '--force', '--log-id', str(self.log.id))
+        self.assertIsNone(cache.get(self.lock_key))
+
+    @mock.patch('analytics.tasks.call_command')
+    def test_lock_is_held_through_retries_and_released_on_final_failure(self, call_command):
+        lock_held = []
+
+        def fail(*args):
+            lock_held.append(cache.get(self.lock_key) is not None)
+            raise RuntimeError('database unavailable')
+
+        call_command.side_effect = fail
+        result = generate_data_profile_task.apply(args=(self.log.id, [], self.lock_key))
+
+        self.assertTrue(result.failed())
+        self.assertEqual(lock_held, [True] * (generate_data_profile_task.max_retries + 1))
+        self.assertIsNone(cache.get(self.lock_key))
+        self.log.refresh_from_db()
+        self.assertEqual(self.log.status, ReportGenerationLog.FAILED)
+        self.assertEqual(self.log.error_message, 'database unavailable')
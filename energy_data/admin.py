@@ -1,11 +1,71 @@
+import csv
+import itertools
+
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 from django.utils.html import format_html
-from django.db.models import Count, Avg
+from django.db.models import Avg, Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Abs, Greatest
 from .models import LoadData, RenewableGeneration, EnergyPrice, DataImportLog
 
+EXPORT_FIELDS = ['utc_timestamp', 'cet_cest_timestamp', 'country_code', 'actual_load_mw', 'forecast_load_mw']
+EXPORT_CHUNK_SIZE = 2000
+
+# ENTSO-E member areas as they appear in OPSD/weather column prefixes
+COUNTRY_CODES = (
+    'AL', 'AT', 'BA', 'BE', 'BG', 'CH', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GB', 'GR', 'HR',
+    'HU', 'IE', 'IT', 'LT', 'LU', 'LV', 'ME', 'MK', 'MT', 'NL', 'NO', 'PL', 'PT', 'RO', 'RS', 'SE', 'SI',
+    'SK', 'UA', 'XK',
+)
+
+
+class Echo:
+    """File-like object whose write() hands back the line, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+class ChangelistOnlyMixin:
+    """Load just the columns the changelist renders; change views still get full rows"""
+    changelist_fields = ()
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        opts = self.model._meta
+        match = request.resolver_match
+        if match and match.url_name == f'{opts.app_label}_{opts.model_name}_changelist':
+            qs = qs.only(*self.changelist_fields)
+        return qs
+
+
+class StaticChoiceFilter(admin.SimpleListFilter):
+    """List filter over a fixed set of choices, so rendering it never runs SELECT DISTINCT on the table"""
+    choices = ()
+
+    def lookups(self, request, model_admin):
+        return self.choices
+
+    def queryset(self, request, queryset):
+        if self.value() is not None:
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+
+class CountryCodeFilter(StaticChoiceFilter):
+    title = 'country code'
+    parameter_name = 'country_code'
+    choices = [(code, code) for code in COUNTRY_CODES]
+
+
+class CurrencyFilter(StaticChoiceFilter):
+    title = 'currency'
+    parameter_name = 'currency'
+    choices = [('EUR', 'EUR'), ('GBP', 'GBP')]
+
 
 @admin.register(LoadData)
-class LoadDataAdmin(admin.ModelAdmin):
+class LoadDataAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'country_code',
         'utc_timestamp',
@@ -14,14 +74,16 @@ class LoadDataAdmin(admin.ModelAdmin):
         'forecast_accuracy'
     ]
     list_filter = [
-        'country_code',
+        CountryCodeFilter,
         ('utc_timestamp', admin.DateFieldListFilter),
         'created_at'
     ]
     search_fields = ['country_code']
     date_hierarchy = 'utc_timestamp'
     ordering = ['-utc_timestamp', 'country_code']
+    show_full_result_count = False
     readonly_fields = ['created_at', 'updated_at', 'forecast_accuracy']
+    changelist_fields = ['country_code', 'utc_timestamp', 'actual_load_mw', 'forecast_load_mw']
 
     fieldsets = (
         ('Time Information', {
@@ -55,10 +117,26 @@ class LoadDataAdmin(admin.ModelAdmin):
     forecast_load_mw_formatted.short_description = "Forecast Load"
     forecast_load_mw_formatted.admin_order_field = 'forecast_load_mw'
 
+    def get_queryset(self, request):
+        # Let the database work out forecast accuracy for the whole page
+        return super().get_queryset(request).annotate(
+            _forecast_accuracy=Case(
+                When(
+                    actual_load_mw__gt=0,
+                    forecast_load_mw__gt=0,
+                    then=Greatest(
+                        Value(0.0),
+                        100 - Abs(F('actual_load_mw') - F('forecast_load_mw')) * 100.0 / F('actual_load_mw')
+                    )
+                ),
+                default=None,
+                output_field=FloatField()
+            )
+        )
+
     def forecast_accuracy(self, obj):
-        if obj.actual_load_mw and obj.forecast_load_mw:
-            error_pct = abs(obj.actual_load_mw - obj.forecast_load_mw) / obj.actual_load_mw * 100
-            accuracy = max(0, 100 - error_pct)
+        accuracy = getattr(obj, '_forecast_accuracy', None)
+        if accuracy is not None:
             color = "green" if accuracy > 95 else "orange" if accuracy > 90 else "red"
             return format_html(
                 '<span style="color: {};">{}%</span>',
@@ -67,18 +145,27 @@ class LoadDataAdmin(admin.ModelAdmin):
         return "-"
 
     forecast_accuracy.short_description = "Forecast Accuracy"
+    forecast_accuracy.admin_order_field = '_forecast_accuracy'
 
     actions = ['export_selected_data']
 
     def export_selected_data(self, request, queryset):
-        # Custom action to export data (could implement CSV export)
-        self.message_user(request, f"Export functionality would process {queryset.count()} records")
+        # Stream rows through a server-side cursor so memory stays flat however many are selected
+        rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        writer = csv.writer(Echo())
+
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in itertools.chain([EXPORT_FIELDS], rows)),
+            content_type='text/csv'
+        )
+        response['Content-Disposition'] = 'attachment; filename="load_data.csv"'
+        return response
 
     export_selected_data.short_description = "Export selected load data"
 
 
 @admin.register(RenewableGeneration)
-class RenewableGenerationAdmin(admin.ModelAdmin):
+class RenewableGenerationAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'country_code',
         'generation_type',
@@ -88,14 +175,19 @@ class RenewableGenerationAdmin(admin.ModelAdmin):
         'capacity_factor_formatted'
     ]
     list_filter = [
-        'country_code',
+        CountryCodeFilter,
         'generation_type',
         ('utc_timestamp', admin.DateFieldListFilter),
     ]
     search_fields = ['country_code', 'generation_type']
     date_hierarchy = 'utc_timestamp'
     ordering = ['-utc_timestamp', 'country_code', 'generation_type']
+    show_full_result_count = False
     readonly_fields = ['created_at', 'updated_at']
+    changelist_fields = [
+        'country_code', 'generation_type', 'utc_timestamp',
+        'actual_generation_mw', 'capacity_mw', 'capacity_factor'
+    ]
 
     fieldsets = (
         ('Time Information', {
@@ -144,7 +236,7 @@ class RenewableGenerationAdmin(admin.ModelAdmin):
 
 
 @admin.register(EnergyPrice)
-class EnergyPriceAdmin(admin.ModelAdmin):
+class EnergyPriceAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'country_code',
         'utc_timestamp',
@@ -153,14 +245,16 @@ class EnergyPriceAdmin(admin.ModelAdmin):
         'bidding_zone'
     ]
     list_filter = [
-        'country_code',
-        'currency',
+        CountryCodeFilter,
+        CurrencyFilter,
         ('utc_timestamp', admin.DateFieldListFilter),
     ]
     search_fields = ['country_code', 'bidding_zone']
     date_hierarchy = 'utc_timestamp'
     ordering = ['-utc_timestamp', 'country_code']
+    show_full_result_count = False
     readonly_fields = ['created_at', 'updated_at']
+    changelist_fields = ['country_code', 'utc_timestamp', 'day_ahead_price', 'currency', 'bidding_zone']
 
     def day_ahead_price_formatted(self, obj):
         if obj.day_ahead_price:
@@ -176,7 +270,7 @@ class EnergyPriceAdmin(admin.ModelAdmin):
 
 
 @admin.register(DataImportLog)
-class DataImportLogAdmin(admin.ModelAdmin):
+class DataImportLogAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'source',
         'import_timestamp',
@@ -193,6 +287,10 @@ class DataImportLogAdmin(admin.ModelAdmin):
     date_hierarchy = 'import_timestamp'
     ordering = ['-import_timestamp']
     readonly_fields = ['import_timestamp']
+    changelist_fields = [
+        'source', 'import_timestamp', 'data_start_date', 'data_end_date',
+        'records_imported', 'records_updated', 'records_failed', 'success'
+    ]
 
     fieldsets = (
         ('Import Information', {
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from django.db import connection
+
+
+@contextmanager
+def secondary_indexes_dropped(tables: List[str], stdout, concurrently: bool = False):
+    """Drop the non-unique indexes on tables for the duration of the block, then rebuild them (PostgreSQL only)"""
+    dropped = []
+    try:
+        drop_secondary_indexes(tables, stdout, dropped, concurrently)
+        yield dropped
+    finally:
+        recreate_indexes(dropped, stdout, concurrently)
+
+
+def drop_secondary_indexes(tables: List[str], stdout, dropped: List[Tuple[str, str]], concurrently: bool = False):
+    """Drop non-unique indexes on tables, appending each one's name and definition to dropped"""
+    qn = connection.ops.quote_name
+    # Indexes on partitioned tables can't be dropped or built CONCURRENTLY
+    drop = 'DROP INDEX CONCURRENTLY IF EXISTS' if concurrently else 'DROP INDEX IF EXISTS'
+
+    # Unique indexes back the primary keys and the ON CONFLICT targets, so they stay
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT schemaname, indexname, indexdef
+            FROM pg_indexes
+            WHERE tablename = ANY(%s) AND indexdef NOT LIKE 'CREATE UNIQUE INDEX%%'
+            """,
+            [tables]
+        )
+        indexes = cursor.fetchall()
+
+        for schema, name, definition in indexes:
+            # Parent indexes read "ON ONLY <table>", which would rebuild an invalid
+            # index on the parent alone; without ONLY it cascades to every partition
+            definition = definition.replace(' ON ONLY ', ' ON ', 1)
+
+            # Echo the DDL so the index can be rebuilt by hand if the import dies
+            stdout.write(f'Dropping index {name}: {definition}')
+            cursor.execute(f'{drop} {qn(schema)}.{qn(name)}')
+            dropped.append((name, definition))
+
+
+def recreate_indexes(indexes: List[Tuple[str, str]], stdout, concurrently: bool = False):
+    """Rebuild indexes dropped by drop_secondary_indexes, without blocking writers when concurrently"""
+    with connection.cursor() as cursor:
+        for name, definition in indexes:
+            stdout.write(f'Recreating index {name}')
+            if concurrently:
+                definition = definition.replace('CREATE INDEX ', 'CREATE INDEX CONCURRENTLY ', 1)
+            cursor.execute(definition)
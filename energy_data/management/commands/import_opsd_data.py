@@ -1,16 +1,83 @@
 # energy_data/management/commands/import_opsd_data.py
 
+import csv
+import functools
+import io
+import itertools
+import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models.base import ModelState
 from django.utils import timezone
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
 import pytz
-from typing import Dict, List, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, List, Tuple
 import logging
 
+from energy_data.indexes import secondary_indexes_dropped
 from energy_data.models import LoadData, RenewableGeneration, EnergyPrice, DataImportLog
 
+TIMESTAMP_COLUMNS = ['utc_timestamp', 'cet_cest_timestamp']
+CSV_BLOCK_SIZE = 32 * 1024 * 1024
+IMPORT_MAINTENANCE_WORK_MEM = '1GB'
+
+# Range-partitioned by month on utc_timestamp (PostgreSQL only)
+PARTITIONED_MODELS = (LoadData, RenewableGeneration, EnergyPrice)
+
+# COUNTRY_TYPE_DETAILS; the lookaheads are tried in order, so a column that
+# mentions several data types lands in the first matching category
+COLUMN_PATTERN = re.compile(
+    r'^(?P<country>[^_]+)_(?:'
+    r'(?=.*load_(?:actual|forecast))(?P<load_data>)'
+    r'|(?=.*generation_actual)(?P<renewable_generation>)'
+    r'|(?=.*capacity)(?P<capacity_data>)'
+    r'|(?=.*price_day_ahead)(?P<energy_prices>)'
+    r')'
+)
+
+GENERATION_TYPE_MAP = {
+    'solar_generation_actual': 'solar',
+    'wind_onshore_generation_actual': 'wind_onshore',
+    'wind_offshore_generation_actual': 'wind_offshore',
+    'wind_generation_actual': 'wind_total'
+}
+
+
+def widen_float32(values) -> np.ndarray:
+    """Widen float32 values to float64 through their shortest repr, so 1234.56 stays 1234.56"""
+    return np.asarray(values, dtype=np.float32).astype(str).astype(np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def column_country_codes(columns: Tuple[str, ...]) -> Dict[str, str]:
+    """Map each COUNTRY_* column to its country code"""
+    return {col: COLUMN_PATTERN.match(col).group('country') for col in columns}
+
+
+@functools.lru_cache(maxsize=None)
+def generation_column_layout(generation_columns: Tuple[str, ...], capacity_columns: Tuple[str, ...]):
+    """Return the modelled generation columns with their generation types and capacity columns"""
+    capacity_set = set(capacity_columns)
+    layout = []
+    for col in generation_columns:
+        generation_type = next((value for key, value in GENERATION_TYPE_MAP.items() if key in col), None)
+        if not generation_type:
+            continue
+
+        capacity_col = col.replace('generation_actual', 'capacity')
+        layout.append((col, generation_type, capacity_col if capacity_col in capacity_set else None))
+
+    if not layout:
+        return (), (), ()
+    return tuple(zip(*layout))
+
 
 class Command(BaseCommand):
     help = 'Import Open Power System Data from CSV file'
@@ -42,6 +109,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Test the import without saving to database'
         )
+        parser.add_argument(
+            '--disable-indexes',
+            action='store_true',
+            help='Drop secondary indexes during the import and rebuild them afterwards (PostgreSQL only)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of batches written to the database concurrently (default: 4)'
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
@@ -52,26 +130,67 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be saved'))
 
         try:
-            # Read and process CSV
-            self.stdout.write('Reading CSV file...')
-            df = self.read_csv_file(csv_file, options)
-
-            # Validate data structure
-            self.validate_csv_structure(df)
-
-            # Parse columns to understand data types
-            column_mapping = self.parse_column_structure(df)
-
-            # Import data
-            import_stats = self.import_data(df, column_mapping, batch_size, dry_run)
+            import_stats = {
+                'load_records': 0,
+                'generation_records': 0,
+                'price_records': 0,
+                'errors': 0
+            }
+            summary = {'rows': 0, 'start': None, 'end': None}
+
+            self.session_tuned = not dry_run and connection.vendor == 'postgresql'
+            disable_indexes = options['disable_indexes'] and self.session_tuned
+            if options['disable_indexes'] and not disable_indexes:
+                self.stdout.write(self.style.WARNING(
+                    '--disable-indexes is ignored for dry runs and non-PostgreSQL databases'
+                ))
+
+            try:
+                if disable_indexes:
+                    # This connection rebuilds the indexes, so give it the larger work memory
+                    self.tune_session()
+
+                # Partitioned tables, so the indexes can't be rebuilt CONCURRENTLY
+                tables = [model._meta.db_table for model in PARTITIONED_MODELS]
+                with secondary_indexes_dropped(tables, self.stdout) if disable_indexes else nullcontext():
+                    # Stream the CSV; the first block tells us the column layout
+                    self.stdout.write('Reading CSV file...')
+                    chunks = self.read_csv_file(csv_file, options)
+                    first_chunk = next(chunks, None)
+
+                    if first_chunk is not None:
+                        # Validate data structure
+                        self.validate_csv_structure(first_chunk)
+
+                        # Parse columns to understand data types
+                        column_mapping = self.parse_column_structure(first_chunk)
+
+                        # Import data
+                        import_stats = self.import_data(
+                            self.summarize_chunks(itertools.chain([first_chunk], chunks), summary),
+                            column_mapping, batch_size, dry_run, options['workers']
+                        )
+            finally:
+                if disable_indexes:
+                    self.reset_session()
+
+            self.stdout.write(f"Loaded {summary['rows']} rows from CSV")
 
             # Log import results
-            if not dry_run:
-                self.log_import_results(csv_file, df, import_stats)
+            if not dry_run and summary['rows']:
+                self.log_import_results(
+                    csv_file, summary['start'], summary['end'], import_stats,
+                    self.import_errors, self.import_parameters(options)
+                )
 
-            self.stdout.write(
-                self.style.SUCCESS(f'Import completed successfully: {import_stats}')
-            )
+            if import_stats['errors']:
+                self.stdout.write(
+                    self.style.WARNING(f'Import completed with failed batches: {import_stats}')
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Import completed successfully: {import_stats}')
+                )
 
         except Exception as e:
             self.stdout.write(
@@ -79,29 +198,71 @@ class Command(BaseCommand):
             )
             raise CommandError(f'Import failed: {str(e)}')
 
-    def read_csv_file(self, csv_file: str, options: dict) -> pd.DataFrame:
-        """Read and filter CSV file"""
-        try:
-            # Read CSV with pandas
-            df = pd.read_csv(csv_file, parse_dates=['utc_timestamp', 'cet_cest_timestamp'])
-
-            # Filter by date range if provided
-            if options.get('start_date'):
-                start_date = pd.to_datetime(options['start_date'])
-                df = df[df['utc_timestamp'] >= start_date]
-
-            if options.get('end_date'):
-                end_date = pd.to_datetime(options['end_date'])
-                df = df[df['utc_timestamp'] <= end_date]
-
-            self.stdout.write(f'Loaded {len(df)} rows from CSV')
-            return df
+    def tune_session(self):
+        """Relax durability and raise index build memory for this connection"""
+        with connection.cursor() as cursor:
+            cursor.execute('SET synchronous_commit = off')
+            cursor.execute(f"SET maintenance_work_mem = '{IMPORT_MAINTENANCE_WORK_MEM}'")
+
+    def reset_session(self):
+        """Restore the session settings changed by tune_session"""
+        with connection.cursor() as cursor:
+            cursor.execute('RESET synchronous_commit')
+            cursor.execute('RESET maintenance_work_mem')
+
+    def read_csv_file(self, csv_file: str, options: dict) -> Iterator[pd.DataFrame]:
+        """Stream and filter the CSV file block by block"""
+        timestamp_type = pa.timestamp('s', tz='UTC')
+        start_date = end_date = None
+        if options.get('start_date'):
+            start_date = pa.scalar(pd.Timestamp(options['start_date'], tz='UTC'), type=timestamp_type)
+        if options.get('end_date'):
+            end_date = pa.scalar(pd.Timestamp(options['end_date'], tz='UTC'), type=timestamp_type)
 
+        try:
+            # Types are inferred per block, so pin them from the header: sparse
+            # columns that are empty in the first block would otherwise be null-typed.
+            # MW and price values need well under float32's ~7 significant digits;
+            # columns the import doesn't use are read as text, so they can't fail the read.
+            with open(csv_file, newline='') as f:
+                header = next(csv.reader(f), [])
+            column_types = {
+                column: (
+                    timestamp_type if column in TIMESTAMP_COLUMNS
+                    else pa.float32() if COLUMN_PATTERN.match(column)
+                    else pa.string()
+                )
+                for column in header
+            }
+
+            # Arrow's multi-threaded tokenizer parses one block at a time
+            reader = pa_csv.open_csv(
+                csv_file,
+                read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                convert_options=pa_csv.ConvertOptions(column_types=column_types)
+            )
         except FileNotFoundError:
             raise CommandError(f'CSV file not found: {csv_file}')
         except Exception as e:
             raise CommandError(f'Error reading CSV: {str(e)}')
 
+        try:
+            for batch in reader:
+                # Filter by date range on the Arrow batch, so rows outside it
+                # are never converted to pandas
+                if 'utc_timestamp' in batch.schema.names:
+                    timestamps = batch.column('utc_timestamp')
+                    if start_date is not None:
+                        batch = batch.filter(pc.greater_equal(timestamps, start_date))
+                        timestamps = batch.column('utc_timestamp')
+
+                    if end_date is not None:
+                        batch = batch.filter(pc.less_equal(timestamps, end_date))
+
+                yield batch.to_pandas()
+        except pa.ArrowInvalid as e:
+            raise CommandError(f'Error reading CSV: {str(e)}')
+
     def validate_csv_structure(self, df: pd.DataFrame):
         """Validate CSV has expected structure"""
         required_columns = ['utc_timestamp', 'cet_cest_timestamp']
@@ -123,29 +284,12 @@ class Command(BaseCommand):
         }
 
         for column in df.columns:
-            if column in ['utc_timestamp', 'cet_cest_timestamp']:
-                continue
-
-            # Parse column pattern: COUNTRY_TYPE_DETAILS
-            parts = column.split('_')
-            if len(parts) < 2:
-                column_mapping['ignored'].append(column)
+            if column in TIMESTAMP_COLUMNS:
                 continue
 
-            country_code = parts[0]
-            data_type = '_'.join(parts[1:])
-
-            # Categorize by data type
-            if 'load_actual' in data_type or 'load_forecast' in data_type:
-                column_mapping['load_data'].append(column)
-            elif 'generation_actual' in data_type:
-                column_mapping['renewable_generation'].append(column)
-            elif 'capacity' in data_type:
-                column_mapping['capacity_data'].append(column)
-            elif 'price_day_ahead' in data_type:
-                column_mapping['energy_prices'].append(column)
-            else:
-                column_mapping['ignored'].append(column)
+            # Parse column pattern: COUNTRY_TYPE_DETAILS and categorize by data type
+            match = COLUMN_PATTERN.match(column)
+            column_mapping[match.lastgroup if match else 'ignored'].append(column)
 
         # Log what we found
         for category, columns in column_mapping.items():
@@ -154,8 +298,20 @@ class Command(BaseCommand):
 
         return column_mapping
 
-    def import_data(self, df: pd.DataFrame, column_mapping: Dict[str, List[str]],
-                    batch_size: int, dry_run: bool) -> Dict[str, int]:
+    def summarize_chunks(self, chunks: Iterable[pd.DataFrame], summary: dict) -> Iterator[pd.DataFrame]:
+        """Pass non-empty chunks through while tracking row count and date range"""
+        for df in chunks:
+            if df.empty:
+                continue
+
+            chunk_start, chunk_end = df['utc_timestamp'].min(), df['utc_timestamp'].max()
+            summary['rows'] += len(df)
+            summary['start'] = chunk_start if summary['start'] is None else min(summary['start'], chunk_start)
+            summary['end'] = chunk_end if summary['end'] is None else max(summary['end'], chunk_end)
+            yield df
+
+    def import_data(self, chunks: Iterable[pd.DataFrame], column_mapping: Dict[str, List[str]],
+                    batch_size: int, dry_run: bool, workers: int) -> Dict[str, int]:
         """Import data into Django models"""
 
         stats = {
@@ -165,216 +321,347 @@ class Command(BaseCommand):
             'errors': 0
         }
 
-        total_rows = len(df)
+        # Workers write batches while this thread keeps parsing the CSV; the
+        # number of batches in flight is capped so parsing can't run far ahead
+        max_pending = max(workers, 1) * 2
+        pending = set()
+        offset = 0
 
-        for start_idx in range(0, total_rows, batch_size):
-            end_idx = min(start_idx + batch_size, total_rows)
-            batch_df = df.iloc[start_idx:end_idx]
+        partitioned = not dry_run and connection.vendor == 'postgresql'
+        self.known_partitions = set()
+        self.import_errors = []
+        self.worker_connections = set()
 
-            self.stdout.write(f'Processing batch {start_idx}-{end_idx} of {total_rows}')
+        try:
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                for df in chunks:
+                    months = df['utc_timestamp'].dt.year * 100 + df['utc_timestamp'].dt.month
+                    if partitioned:
+                        self.ensure_month_partitions(months.unique())
+
+                    # Split on month boundaries so each batch lands in a single partition
+                    for _, month_df in df.groupby(months, sort=False):
+                        for start_idx in range(0, len(month_df), batch_size):
+                            batch_df = month_df.iloc[start_idx:start_idx + batch_size]
+
+                            batch_range = (offset, offset + len(batch_df))
+                            self.stdout.write(f'Processing batch {batch_range[0]}-{batch_range[1]}')
+                            offset += len(batch_df)
+
+                            pending.add(executor.submit(
+                                self.process_batch, batch_df, column_mapping, dry_run, batch_range
+                            ))
+                            if len(pending) >= max_pending:
+                                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                                self.add_batch_stats(stats, done)
+
+                done, _ = wait(pending)
+                self.add_batch_stats(stats, done)
+        finally:
+            self.close_worker_connections()
+
+        return stats
+
+    def close_worker_connections(self):
+        """Close the connections the worker threads opened, once they have all finished"""
+        for worker_connection in self.worker_connections:
+            # Created on a worker thread, so closing from here has to be allowed explicitly
+            worker_connection.inc_thread_sharing()
+            try:
+                worker_connection.close()
+            finally:
+                worker_connection.dec_thread_sharing()
+        self.worker_connections = set()
+
+    def ensure_month_partitions(self, months: Iterable[int]):
+        """Create the monthly partitions (keyed YYYYMM) that don't exist yet"""
+        for month in sorted(months):
+            if month in self.known_partitions:
+                continue
+
+            year, month_number = divmod(int(month), 100)
+            start = datetime(year, month_number, 1, tzinfo=dt_timezone.utc)
+            end = datetime(year + month_number // 12, month_number % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+            for model in PARTITIONED_MODELS:
+                table = model._meta.db_table
+                partition = f'{table}_p{year}_{month_number:02d}'
+
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute('SELECT to_regclass(%s)', [partition])
+                    if cursor.fetchone()[0]:
+                        continue
+
+                    # Rows for this month may already sit in the default partition;
+                    # they have to move out before the month's partition can exist
+                    cursor.execute(f'CREATE TEMP TABLE _moved ON COMMIT DROP AS SELECT * FROM {table} WITH NO DATA')
+                    cursor.execute(
+                        f'WITH moved AS (DELETE FROM {table}_default '
+                        f'WHERE utc_timestamp >= %s AND utc_timestamp < %s RETURNING *) '
+                        f'INSERT INTO _moved SELECT * FROM moved',
+                        [start, end]
+                    )
+                    cursor.execute(
+                        f'CREATE TABLE {partition} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)',
+                        [start, end]
+                    )
+                    cursor.execute(f'INSERT INTO {table} SELECT * FROM _moved')
+
+            self.known_partitions.add(month)
+
+    def add_batch_stats(self, stats: Dict[str, int], futures):
+        """Sum the counts returned by finished batches into stats"""
+        for future in futures:
+            for key, value in future.result().items():
+                stats[key] += value
+
+    def process_batch(self, batch_df: pd.DataFrame, column_mapping: Dict[str, List[str]],
+                      dry_run: bool, batch_range: Tuple[int, int]) -> Dict[str, int]:
+        """Import one batch on the calling worker thread's own connection"""
+        if dry_run:
+            # Dry run - just count what would be imported
+            return self.count_batch_records(batch_df, column_mapping)
 
-            if not dry_run:
-                with transaction.atomic():
+        try:
+            # Django connections are per thread: each worker opens (and tunes) its
+            # own once and reuses it for every batch it runs
+            worker_connection = connections[DEFAULT_DB_ALIAS]
+            if worker_connection not in self.worker_connections:
+                if self.session_tuned:
+                    self.tune_session()
+                self.worker_connections.add(worker_connection)
+
+            with transaction.atomic():
+                return {
                     # Import load data
-                    load_count = self.import_load_data(batch_df, column_mapping['load_data'])
-                    stats['load_records'] += load_count
+                    'load_records': self.import_load_data(batch_df, column_mapping['load_data']),
 
                     # Import renewable generation data
-                    gen_count = self.import_generation_data(
+                    'generation_records': self.import_generation_data(
                         batch_df,
                         column_mapping['renewable_generation'],
                         column_mapping['capacity_data']
-                    )
-                    stats['generation_records'] += gen_count
+                    ),
 
                     # Import price data
-                    price_count = self.import_price_data(batch_df, column_mapping['energy_prices'])
-                    stats['price_records'] += price_count
-            else:
-                # Dry run - just count what would be imported
-                stats['load_records'] += self.count_load_records(batch_df, column_mapping['load_data'])
-                stats['generation_records'] += self.count_generation_records(batch_df,
-                                                                             column_mapping['renewable_generation'])
-                stats['price_records'] += self.count_price_records(batch_df, column_mapping['energy_prices'])
+                    'price_records': self.import_price_data(batch_df, column_mapping['energy_prices']),
+                }
+        except Exception as e:
+            # The batch rolled back; record it and let the remaining batches continue
+            self.stdout.write(self.style.ERROR(f'Batch {batch_range[0]}-{batch_range[1]} failed: {e}'))
+            self.import_errors.append({
+                'batch': list(batch_range),
+                'utc_range': [
+                    batch_df['utc_timestamp'].iloc[0].isoformat(),
+                    batch_df['utc_timestamp'].iloc[-1].isoformat()
+                ],
+                'exception': repr(e),
+            })
+            # Count failures in the same per-country records the imported counts use,
+            # not in CSV rows
+            return {'errors': sum(self.count_batch_records(batch_df, column_mapping).values())}
+
+    def count_batch_records(self, batch_df: pd.DataFrame, column_mapping: Dict[str, List[str]]) -> Dict[str, int]:
+        """Count the records a batch imports, keyed the same way the import functions key them"""
+        load_codes = column_country_codes(tuple(column_mapping['load_data']))
+        price_codes = column_country_codes(tuple(column_mapping['energy_prices']))
+        generation_cols, generation_types, _ = generation_column_layout(
+            tuple(column_mapping['renewable_generation']), tuple(column_mapping['capacity_data'])
+        )
+        generation_codes = column_country_codes(generation_cols)
+
+        return {
+            # Actual and forecast load merge into one record per country
+            'load_records': self.count_records(batch_df, load_codes),
+            'generation_records': self.count_records(batch_df, {
+                col: (generation_codes[col], generation_type)
+                for col, generation_type in zip(generation_cols, generation_types)
+            }),
+            'price_records': self.count_records(batch_df, price_codes),
+        }
 
-        return stats
+    def melt_by_country(self, df: pd.DataFrame, columns: List[str], value_name: str) -> pd.DataFrame:
+        """Reshape wide COUNTRY_* columns into long rows keyed by timestamp and country"""
+        melted = df[TIMESTAMP_COLUMNS + columns].melt(
+            id_vars=TIMESTAMP_COLUMNS,
+            var_name='col',
+            value_name=value_name
+        )
+        # melt stacks column by column, so per-column labels repeat once per row
+        country_codes = column_country_codes(tuple(columns))
+        melted['country_code'] = np.repeat([country_codes[col] for col in columns], len(df))
+        return melted
+
+    def to_model_records(self, df: pd.DataFrame) -> List[dict]:
+        """Convert a long-form frame to field dicts, turning NaN into None"""
+        # A plain float() of a float32 would store its binary error (1234.56005859375)
+        df = df.assign(**{
+            column: widen_float32(df[column]) for column in df.select_dtypes(np.float32).columns
+        })
+        return df.astype(object).where(df.notna(), None).to_dict('records')
 
     def import_load_data(self, df: pd.DataFrame, load_columns: List[str]) -> int:
         """Import load data (actual and forecast)"""
-        load_records = []
-
-        # Group load columns by country
-        country_loads = {}
-        for col in load_columns:
-            country_code = col.split('_')[0]
-            if country_code not in country_loads:
-                country_loads[country_code] = {}
-
-            if 'load_actual' in col:
-                country_loads[country_code]['actual'] = col
-            elif 'load_forecast' in col:
-                country_loads[country_code]['forecast'] = col
-
-        # Create load records
-        for _, row in df.iterrows():
-            for country_code, columns in country_loads.items():
-                actual_col = columns.get('actual')
-                forecast_col = columns.get('forecast')
-
-                # Skip if both actual and forecast are null
-                actual_val = row.get(actual_col) if actual_col else None
-                forecast_val = row.get(forecast_col) if forecast_col else None
-
-                if pd.isna(actual_val) and pd.isna(forecast_val):
-                    continue
-
-                load_record = LoadData(
-                    utc_timestamp=row['utc_timestamp'],
-                    cet_cest_timestamp=row['cet_cest_timestamp'],
-                    country_code=country_code,
-                    actual_load_mw=actual_val if not pd.isna(actual_val) else None,
-                    forecast_load_mw=forecast_val if not pd.isna(forecast_val) else None
-                )
-                load_records.append(load_record)
+        key_columns = TIMESTAMP_COLUMNS + ['country_code']
+        actual_cols = [col for col in load_columns if 'load_actual' in col]
+        forecast_cols = [col for col in load_columns if 'load_forecast' in col]
 
-        # Bulk create
-        if load_records:
-            LoadData.objects.bulk_create(
-                load_records,
-                ignore_conflicts=True,
-                batch_size=500
-            )
+        # Several regional columns can share a country prefix; the last one wins
+        actual = self.melt_by_country(df, actual_cols, 'actual_load_mw')
+        actual = actual.drop(columns='col').drop_duplicates(key_columns, keep='last')
+        forecast = self.melt_by_country(df, forecast_cols, 'forecast_load_mw')
+        forecast = forecast.drop(columns='col').drop_duplicates(key_columns, keep='last')
+
+        merged = actual.merge(forecast, on=key_columns, how='outer')
+
+        # Skip if both actual and forecast are null
+        merged = merged[merged['actual_load_mw'].notna() | merged['forecast_load_mw'].notna()]
 
-        return len(load_records)
+        return self.write_records(LoadData, merged)
 
     def import_generation_data(self, df: pd.DataFrame, generation_columns: List[str],
                                capacity_columns: List[str]) -> int:
         """Import renewable generation data"""
-        generation_records = []
-
-        # Map generation types
-        generation_type_map = {
-            'solar_generation_actual': 'solar',
-            'wind_onshore_generation_actual': 'wind_onshore',
-            'wind_offshore_generation_actual': 'wind_offshore',
-            'wind_generation_actual': 'wind_total'
-        }
-
-        # Group by country and generation type
-        for _, row in df.iterrows():
-            for col in generation_columns:
-                parts = col.split('_')
-                country_code = parts[0]
-
-                # Determine generation type
-                generation_type = None
-                for key, value in generation_type_map.items():
-                    if key in col:
-                        generation_type = value
-                        break
-
-                if not generation_type:
-                    continue
-
-                generation_val = row.get(col)
-                if pd.isna(generation_val):
-                    continue
-
-                # Look for corresponding capacity data
-                capacity_val = None
-                capacity_col = col.replace('generation_actual', 'capacity')
-                if capacity_col in capacity_columns:
-                    capacity_val = row.get(capacity_col)
-                    if pd.isna(capacity_val):
-                        capacity_val = None
-
-                # Calculate capacity factor if both generation and capacity available
-                capacity_factor = None
-                if capacity_val and capacity_val > 0:
-                    capacity_factor = generation_val / capacity_val
-
-                generation_record = RenewableGeneration(
-                    utc_timestamp=row['utc_timestamp'],
-                    cet_cest_timestamp=row['cet_cest_timestamp'],
-                    country_code=country_code,
-                    generation_type=generation_type,
-                    actual_generation_mw=generation_val,
-                    capacity_mw=capacity_val,
-                    capacity_factor=capacity_factor
-                )
-                generation_records.append(generation_record)
+        generation_cols, generation_types, capacity_cols = generation_column_layout(
+            tuple(generation_columns), tuple(capacity_columns)
+        )
+        if not generation_cols:
+            return 0
+
+        melted = self.melt_by_country(df, list(generation_cols), 'actual_generation_mw')
+        melted['generation_type'] = np.repeat(generation_types, len(df))
+
+        # Look for corresponding capacity data, laid out in the same column order
+        # as the melted generation values so the flattened arrays line up
+        capacity = pd.DataFrame({
+            col: df[capacity_col] if capacity_col else np.nan
+            for col, capacity_col in zip(generation_cols, capacity_cols)
+        }, index=df.index)
+        # Kept float32 like the other value columns, so COPY writes it as read
+        melted['capacity_mw'] = capacity.to_numpy(dtype=np.float32).ravel(order='F')
+
+        melted = melted[melted['actual_generation_mw'].notna()]
+        melted = melted.drop_duplicates(
+            TIMESTAMP_COLUMNS + ['country_code', 'generation_type'], keep='first'
+        )
 
-        # Bulk create
-        if generation_records:
-            RenewableGeneration.objects.bulk_create(
-                generation_records,
-                ignore_conflicts=True,
-                batch_size=500
-            )
+        # Calculate capacity factor if both generation and capacity available
+        generation_mw = widen_float32(melted['actual_generation_mw'])
+        capacity_mw = widen_float32(melted['capacity_mw'])
+        melted['capacity_factor'] = np.divide(
+            generation_mw, capacity_mw,
+            out=np.full_like(generation_mw, np.nan),
+            where=capacity_mw > 0
+        )
 
-        return len(generation_records)
+        return self.write_records(RenewableGeneration, melted.drop(columns='col'))
 
     def import_price_data(self, df: pd.DataFrame, price_columns: List[str]) -> int:
         """Import energy price data"""
-        price_records = []
-
-        for _, row in df.iterrows():
-            for col in price_columns:
-                country_code = col.split('_')[0]
-                price_val = row.get(col)
-
-                if pd.isna(price_val):
-                    continue
+        melted = self.melt_by_country(df, price_columns, 'day_ahead_price')
+        melted = melted[melted['day_ahead_price'].notna()]
+        melted = melted.drop_duplicates(TIMESTAMP_COLUMNS + ['country_code'], keep='first')
+
+        # Determine currency (EUR for most, GBP for GB regions)
+        melted['currency'] = np.where(melted['country_code'].str.startswith('GB'), 'GBP', 'EUR')
+
+        return self.write_records(EnergyPrice, melted.drop(columns='col'))
+
+    def write_records(self, model, df: pd.DataFrame) -> int:
+        """Upsert long-form rows, refreshing values of rows that already exist"""
+        if df.empty:
+            return 0
+
+        # Rows are keyed by the model's unique_together; everything else is refreshed
+        unique_fields = list(model._meta.unique_together[0])
+        update_fields = [name for name in df.columns if name not in unique_fields]
+
+        if connection.vendor == 'postgresql':
+            self._copy_records(model, df, unique_fields, update_fields)
+        else:
+            model.objects.bulk_create(
+                self.build_instances(model, self.to_model_records(df)),
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+                batch_size=500
+            )
 
-                # Determine currency (EUR for most, GBP for GB regions)
-                currency = 'GBP' if country_code.startswith('GB') else 'EUR'
+        return len(df)
+
+    def build_instances(self, model, records: List[dict]) -> list:
+        """Build unsaved instances without running Model.__init__ for every row"""
+        if not records:
+            return []
+
+        # The regular constructor checks the field names once and supplies the defaults
+        template = model(**records[0])
+        defaults = {key: value for key, value in template.__dict__.items() if key != '_state'}
+
+        instances = [None] * len(records)
+        for i, record in enumerate(records):
+            instance = model.__new__(model)
+            instance.__dict__.update(defaults)
+            instance.__dict__.update(record)
+            instance._state = ModelState()
+            instances[i] = instance
+        return instances
+
+    def _copy_records(self, model, df: pd.DataFrame, unique_fields: List[str], update_fields: List[str]):
+        """COPY rows into a temp staging table, then upsert them with ON CONFLICT DO UPDATE"""
+        opts = model._meta
+        qn = connection.ops.quote_name
+
+        def column_list(names):
+            return ', '.join(qn(opts.get_field(name).column) for name in names)
+
+        table = qn(opts.db_table)
+        staging = qn(f'_stg_{opts.model_name}')
+        columns = column_list(df.columns)
+        # created_at/updated_at come from column defaults and the update trigger
+        assignments = ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in [qn(opts.get_field(name).column) for name in update_fields]
+        )
 
-                price_record = EnergyPrice(
-                    utc_timestamp=row['utc_timestamp'],
-                    cet_cest_timestamp=row['cet_cest_timestamp'],
-                    country_code=country_code,
-                    day_ahead_price=price_val,
-                    currency=currency
-                )
-                price_records.append(price_record)
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
 
-        # Bulk create
-        if price_records:
-            EnergyPrice.objects.bulk_create(
-                price_records,
-                ignore_conflicts=True,
-                batch_size=500
+        # Temp tables are never WAL-logged; the staging table goes away on commit
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE {staging} ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {table} WITH NO DATA'
+            )
+            cursor.copy_expert(f'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) '
+                f'SELECT {columns} FROM {staging} '
+                f'ON CONFLICT ({column_list(unique_fields)}) DO UPDATE SET {assignments}'
             )
 
-        return len(price_records)
-
-    def count_load_records(self, df: pd.DataFrame, load_columns: List[str]) -> int:
-        """Count load records for dry run"""
-        count = 0
-        for col in load_columns:
-            count += df[col].notna().sum()
-        return count
-
-    def count_generation_records(self, df: pd.DataFrame, generation_columns: List[str]) -> int:
-        """Count generation records for dry run"""
-        count = 0
-        for col in generation_columns:
-            count += df[col].notna().sum()
-        return count
-
-    def count_price_records(self, df: pd.DataFrame, price_columns: List[str]) -> int:
-        """Count price records for dry run"""
-        count = 0
-        for col in price_columns:
-            count += df[col].notna().sum()
-        return count
-
-    def log_import_results(self, csv_file: str, df: pd.DataFrame, stats: Dict[str, int]):
+    def count_records(self, df: pd.DataFrame, column_keys: Dict[str, object]) -> int:
+        """Count rows with a value in any column of each record key (columns sharing a key are one record)"""
+        groups = {}
+        for col, key in column_keys.items():
+            groups.setdefault(key, []).append(col)
+        return sum(int(df[cols].notna().any(axis=1).sum()) for cols in groups.values())
+
+    def import_parameters(self, options: dict) -> dict:
+        """Options worth keeping with the import log"""
+        return {
+            key: options.get(key)
+            for key in ('start_date', 'end_date', 'batch_size', 'workers', 'disable_indexes')
+        }
+
+    def log_import_results(self, csv_file: str, data_start_date: datetime, data_end_date: datetime,
+                           stats: Dict[str, int], errors: List[dict], parameters: dict):
         """Log import results to DataImportLog"""
         DataImportLog.objects.create(
             source='opsd',
-            data_start_date=df['utc_timestamp'].min(),
-            data_end_date=df['utc_timestamp'].max(),
+            data_start_date=data_start_date,
+            data_end_date=data_end_date,
             records_imported=sum([
                 stats['load_records'],
                 stats['generation_records'],
@@ -382,5 +669,7 @@ class Command(BaseCommand):
             ]),
             records_failed=stats['errors'],
             file_name=csv_file,
-            success=stats['errors'] == 0
+            success=stats['errors'] == 0,
+            import_parameters=parameters,
+            error_log={'errors': errors} if errors else {}
         )
\ No newline at end of file
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('energy_data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='energyprice',
+            index=models.Index(fields=['utc_timestamp', 'country_code'], name='energy_data_utc_tim_375bf9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loaddata',
+            index=models.Index(fields=['utc_timestamp', 'country_code'], name='energy_data_utc_tim_3ede52_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='renewablegeneration',
+            index=models.Index(fields=['utc_timestamp', 'country_code'], name='energy_data_utc_tim_2bbc57_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:55
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('energy_data', '0002_energyprice_energy_data_utc_tim_375bf9_idx_and_more'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='energyprice',
+            name='energy_data_utc_tim_375bf9_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='loaddata',
+            name='energy_data_utc_tim_3ede52_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='renewablegeneration',
+            name='energy_data_utc_tim_2bbc57_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='dataimportlog',
+            index=models.Index(condition=models.Q(('success', False)), fields=['-import_timestamp'], name='dataimportlog_failed_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='energyprice',
+            index=models.Index(fields=['-utc_timestamp', 'country_code'], name='energy_data_utc_tim_4af437_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='loaddata',
+            index=models.Index(fields=['-utc_timestamp', 'country_code'], name='energy_data_utc_tim_8a4494_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='renewablegeneration',
+            index=models.Index(fields=['-utc_timestamp', 'country_code', 'generation_type'], name='energy_data_utc_tim_82b641_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='renewablegeneration',
+            index=models.Index(fields=['country_code', 'generation_type', '-utc_timestamp'], name='energy_data_country_8b0422_idx'),
+        ),
+    ]
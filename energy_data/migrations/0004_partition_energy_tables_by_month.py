@@ -0,0 +1,136 @@
+import re
+
+from django.db import migrations
+
+PARTITIONED_TABLES = [
+    'energy_data_loaddata',
+    'energy_data_renewablegeneration',
+    'energy_data_energyprice',
+]
+
+
+def partition_table(cursor, table):
+    """Rebuild table as a parent range-partitioned by month on utc_timestamp"""
+    old = f'{table}_unpartitioned'
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+
+    # Remember unique constraints and secondary indexes so they can be rebuilt
+    # on the parent under the names Django's migration state knows about
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'u'",
+        [old]
+    )
+    unique_constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [old, old]
+    )
+    indexes = cursor.fetchall()
+
+    cursor.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (utc_timestamp)')
+
+    # One partition per month covering the existing data through the next year,
+    # plus a default partition for anything outside that range
+    cursor.execute(
+        f"""
+        SELECT to_char(month, 'YYYY_MM'), month, month + interval '1 month'
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min(utc_timestamp) FROM {old}), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', GREATEST((SELECT max(utc_timestamp) FROM {old}), now()) AT TIME ZONE 'UTC')
+                + interval '12 months',
+            interval '1 month'
+        ) AS month
+        """
+    )
+    for suffix, start, end in cursor.fetchall():
+        cursor.execute(
+            f"CREATE TABLE {table}_p{suffix} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d} 00:00+00') TO ('{end:%Y-%m-%d} 00:00+00')"
+        )
+    cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    # Constraint and index names are still taken by the old table, so build
+    # them once it is gone (which is also cheaper than indexing row by row)
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    cursor.execute(f'DROP TABLE {old}')
+
+    # The old identity sequence went with the old table; ids continue from a new one
+    cursor.execute(f'CREATE SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+    cursor.execute(f"SELECT setval('{table}_id_seq', COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)")
+
+    # Primary keys on partitioned tables must include the partition key
+    cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, utc_timestamp)')
+
+    for name, definition in unique_constraints:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for name, definition in indexes:
+        cursor.execute(re.sub(rf' ON (\S+\.)?{old} ', f' ON {table} ', definition, count=1))
+
+
+def unpartition_table(cursor, table):
+    """Rebuild a month-partitioned parent as the plain table it replaced"""
+    old = f'{table}_partitioned'
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'u'",
+        [old]
+    )
+    unique_constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s "
+        "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        [old, old]
+    )
+    indexes = cursor.fetchall()
+
+    # The id default points at the parent's sequence, which goes with the parent
+    cursor.execute(f'CREATE TABLE {table} (LIKE {old})')
+    cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    cursor.execute(f'DROP TABLE {old}')
+
+    # Restore the identity column Django created the table with
+    cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"COALESCE((SELECT max(id) FROM {table}), 0) + 1, false)"
+    )
+    cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+
+    for name, definition in unique_constraints:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for name, definition in indexes:
+        cursor.execute(re.sub(rf' ON (ONLY )?(\S+\.)?{old} ', f' ON {table} ', definition, count=1))
+
+
+def partition_energy_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            partition_table(cursor, table)
+
+
+def unpartition_energy_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            unpartition_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('energy_data', '0003_remove_energyprice_energy_data_utc_tim_375bf9_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_energy_tables, unpartition_energy_tables),
+    ]
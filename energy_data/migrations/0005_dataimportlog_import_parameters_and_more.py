@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:59
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('energy_data', '0004_partition_energy_tables_by_month'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataimportlog',
+            name='import_parameters',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='dataimportlog',
+            name='records_failed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dataimportlog',
+            name='records_updated',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # Existing free-text logs become {'errors': [{'exception': <text>}]}; the
+        # default cast would reject empty strings and non-JSON messages
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE energy_data_dataimportlog ALTER COLUMN error_log TYPE jsonb USING CASE
+                    WHEN error_log = '' THEN '{}'::jsonb
+                    ELSE jsonb_build_object('errors', jsonb_build_array(jsonb_build_object('exception', error_log)))
+                END
+            """,
+            reverse_sql="""
+                ALTER TABLE energy_data_dataimportlog ALTER COLUMN error_log TYPE text USING CASE
+                    WHEN error_log = '{}'::jsonb THEN ''
+                    ELSE error_log::text
+                END
+            """,
+            state_operations=[
+                migrations.AlterField(
+                    model_name='dataimportlog',
+                    name='error_log',
+                    field=models.JSONField(blank=True, default=dict, help_text="Structured errors, e.g. {'errors': [{'batch': [start, end], 'exception': ...}]}"),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dataimportlog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['error_log'], name='dataimportlog_error_log_gin'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:11
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('energy_data', '0005_dataimportlog_import_parameters_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='energyprice',
+            name='utc_timestamp',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='loaddata',
+            name='utc_timestamp',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='renewablegeneration',
+            name='utc_timestamp',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='energyprice',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['utc_timestamp'], name='energyprice_utc_ts_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='loaddata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['utc_timestamp'], name='loaddata_utc_ts_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='renewablegeneration',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['utc_timestamp'], name='renewablegen_utc_ts_brin', pages_per_range=32),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:12
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+TOUCHED_TABLES = [
+    'energy_data_loaddata',
+    'energy_data_renewablegeneration',
+    'energy_data_energyprice',
+]
+
+CREATE_TOUCH_FUNCTION = """
+CREATE FUNCTION energy_data_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Also fires for the DO UPDATE branch of INSERT ... ON CONFLICT
+CREATE_TOUCH_TRIGGERS = [
+    f'CREATE TRIGGER {table}_touch_updated_at BEFORE UPDATE ON {table} '
+    f'FOR EACH ROW EXECUTE FUNCTION energy_data_touch_updated_at()'
+    for table in TOUCHED_TABLES
+]
+
+DROP_TOUCH_TRIGGERS = [
+    f'DROP TRIGGER {table}_touch_updated_at ON {table}' for table in TOUCHED_TABLES
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('energy_data', '0006_alter_energyprice_utc_timestamp_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='energyprice',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='energyprice',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='loaddata',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='loaddata',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='renewablegeneration',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.AlterField(
+            model_name='renewablegeneration',
+            name='updated_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+        migrations.RunSQL(CREATE_TOUCH_FUNCTION, 'DROP FUNCTION energy_data_touch_updated_at()'),
+        migrations.RunSQL(CREATE_TOUCH_TRIGGERS, DROP_TOUCH_TRIGGERS),
+    ]
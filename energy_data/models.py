@@ -2,16 +2,20 @@ from django.db import models
 
 # Create your models here.
 from django.db import models
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.core.validators import MinValueValidator
+from django.db.models.functions import Now
 
 
 class BaseEnergyData(models.Model):
     """Abstract base model for all energy data"""
-    utc_timestamp = models.DateTimeField(db_index=True)
+    # Indexed with BRIN on each concrete model; rows arrive in time order
+    utc_timestamp = models.DateTimeField()
     cet_cest_timestamp = models.DateTimeField(db_index=True)
     country_code = models.CharField(max_length=10, db_index=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Filled by the database: column defaults on insert, a trigger on update (see migration 0007)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+    updated_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
         abstract = True
@@ -20,6 +24,18 @@ class BaseEnergyData(models.Model):
         ]
 
 
+class LoadDataManager(models.Manager):
+    def bulk_upsert(self, objs, batch_size=1000):
+        """Insert load rows in multi-row batches, overwriting values already stored for a country and hour"""
+        return self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['country_code', 'utc_timestamp'],
+            update_fields=['cet_cest_timestamp', 'actual_load_mw', 'forecast_load_mw']
+        )
+
+
 class LoadData(BaseEnergyData):
     """Electricity load data (actual and forecast)"""
     actual_load_mw = models.FloatField(
@@ -33,8 +49,14 @@ class LoadData(BaseEnergyData):
         help_text="Day-ahead load forecast in MW"
     )
 
+    objects = LoadDataManager()
+
     class Meta:
         unique_together = ['country_code', 'utc_timestamp']
+        indexes = [
+            models.Index(fields=['-utc_timestamp', 'country_code']),
+            BrinIndex(fields=['utc_timestamp'], pages_per_range=32, name='loaddata_utc_ts_brin'),
+        ]
         verbose_name = "Load Data"
         verbose_name_plural = "Load Data"
 
@@ -67,6 +89,11 @@ class RenewableGeneration(BaseEnergyData):
 
     class Meta:
         unique_together = ['country_code', 'utc_timestamp', 'generation_type']
+        indexes = [
+            models.Index(fields=['-utc_timestamp', 'country_code', 'generation_type']),
+            models.Index(fields=['country_code', 'generation_type', '-utc_timestamp']),
+            BrinIndex(fields=['utc_timestamp'], pages_per_range=32, name='renewablegen_utc_ts_brin'),
+        ]
 
 
 class EnergyPrice(BaseEnergyData):
@@ -77,6 +104,10 @@ class EnergyPrice(BaseEnergyData):
 
     class Meta:
         unique_together = ['country_code', 'utc_timestamp']
+        indexes = [
+            models.Index(fields=['-utc_timestamp', 'country_code']),
+            BrinIndex(fields=['utc_timestamp'], pages_per_range=32, name='energyprice_utc_ts_brin'),
+        ]
 
 
 class DataImportLog(models.Model):
@@ -92,6 +123,23 @@ class DataImportLog(models.Model):
     data_start_date = models.DateTimeField()
     data_end_date = models.DateTimeField()
     records_imported = models.PositiveIntegerField(default=0)
+    records_updated = models.PositiveIntegerField(default=0)
+    records_failed = models.PositiveIntegerField(default=0)
     file_name = models.CharField(max_length=255, null=True, blank=True)
     success = models.BooleanField(default=True)
-    error_log = models.TextField(blank=True)
+    import_parameters = models.JSONField(default=dict, blank=True)
+    error_log = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Structured errors, e.g. {'errors': [{'batch': [start, end], 'exception': ...}]}"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-import_timestamp'],
+                condition=models.Q(success=False),
+                name='dataimportlog_failed_idx'
+            ),
+            GinIndex(fields=['error_log'], name='dataimportlog_error_log_gin'),
+        ]
@@ -1,3 +1,185 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from energy_data.management.commands.import_opsd_data import Command as ImportOpsdCommand
+from energy_data.models import LoadData, RenewableGeneration, EnergyPrice, DataImportLog
+
+ENERGY_TABLES = [model._meta.db_table for model in (LoadData, RenewableGeneration, EnergyPrice)]
+
+# Two months, so the import spans more than one partition
+OPSD_CSV = """\
+utc_timestamp,cet_cest_timestamp,DE_load_actual_entsoe_transparency,DE_load_forecast_entsoe_transparency,DE_solar_capacity,DE_solar_generation_actual,DE_price_day_ahead,FR_load_actual_entsoe_transparency
+2019-01-31T22:00:00Z,2019-01-31T23:00:00+0100,50000.5,51000,40000,0,45.2,60000
+2019-01-31T23:00:00Z,2019-02-01T00:00:00+0100,49000,50000,40000,0,44.1,
+2019-02-01T00:00:00Z,2019-02-01T01:00:00+0100,48000.25,,40000,10,,59000
+"""
+
+
+def write_csv(test_case, content):
+    """Write content to a temporary CSV removed when the test ends"""
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    test_case.addCleanup(os.remove, path)
+    return path
+
+
+# Worker threads write on their own connections, so the rows have to be committed
+class ImportOpsdDataIndexTests(TransactionTestCase):
+    def import_csv(self, *args):
+        call_command('import_opsd_data', write_csv(self, OPSD_CSV), *args, stdout=StringIO())
+
+    def test_disable_indexes_rebuilds_valid_indexes_on_every_partition(self):
+        self.import_csv('--disable-indexes')
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE NOT i.indisvalid"
+            )
+            self.assertEqual(cursor.fetchall(), [])
+
+            for model in (LoadData, RenewableGeneration, EnergyPrice):
+                table = model._meta.db_table
+                cursor.execute('SELECT indexname FROM pg_indexes WHERE tablename = %s', [table])
+                parent_indexes = {row[0] for row in cursor.fetchall()}
+                for index in model._meta.indexes:
+                    self.assertIn(index.name, parent_indexes)
+
+                # Every parent index has a built counterpart on the partitions
+                cursor.execute(
+                    'SELECT count(*) FROM pg_indexes WHERE tablename = %s', [f'{table}_p2019_02']
+                )
+                self.assertEqual(cursor.fetchone()[0], len(parent_indexes))
+
+
+class ImportOpsdDataTests(TransactionTestCase):
+    def import_csv(self, content):
+        call_command('import_opsd_data', write_csv(self, content), stdout=StringIO())
+
+    def test_import_stores_values_as_written(self):
+        self.import_csv(OPSD_CSV)
+
+        self.assertEqual(LoadData.objects.count(), 5)
+        self.assertEqual(RenewableGeneration.objects.count(), 3)
+        self.assertEqual(EnergyPrice.objects.count(), 2)
+
+        first_hour = datetime(2019, 1, 31, 22, tzinfo=dt_timezone.utc)
+        load = LoadData.objects.get(country_code='DE', utc_timestamp=first_hour)
+        self.assertEqual((load.actual_load_mw, load.forecast_load_mw), (50000.5, 51000))
+        # float32 parsing must not leak binary noise into the stored doubles
+        self.assertEqual(EnergyPrice.objects.get(country_code='DE', utc_timestamp=first_hour).day_ahead_price, 45.2)
+        solar = RenewableGeneration.objects.get(utc_timestamp=datetime(2019, 2, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual((solar.capacity_mw, solar.capacity_factor), (40000, 10 / 40000))
+
+        log = DataImportLog.objects.get()
+        self.assertEqual((log.records_imported, log.records_failed, log.success), (10, 0, True))
+
+    def test_reimport_updates_existing_rows(self):
+        self.import_csv(OPSD_CSV)
+        self.import_csv(OPSD_CSV.replace(',45.2,', ',50.75,'))
+
+        self.assertEqual(EnergyPrice.objects.count(), 2)
+        price = EnergyPrice.objects.get(utc_timestamp=datetime(2019, 1, 31, 22, tzinfo=dt_timezone.utc))
+        self.assertEqual(price.day_ahead_price, 50.75)
+        self.assertGreater(price.updated_at, price.created_at)
+
+    def test_dry_run_counts_without_writing(self):
+        out = StringIO()
+        call_command('import_opsd_data', write_csv(self, OPSD_CSV), '--dry-run', stdout=out)
+
+        self.assertIn("'load_records': 5, 'generation_records': 3, 'price_records': 2, 'errors': 0", out.getvalue())
+        self.assertFalse(LoadData.objects.exists())
+
+    def test_unused_text_columns_are_read_without_failing(self):
+        lines = OPSD_CSV.splitlines()
+        content = '\n'.join([lines[0] + ',source_note'] + [line + ',manual check' for line in lines[1:]]) + '\n'
+
+        self.import_csv(content)
+
+        self.assertEqual(LoadData.objects.count(), 5)
+
+
+class EnsureMonthPartitionsTests(TransactionTestCase):
+    def setUp(self):
+        self.addCleanup(self.drop_partitions)
+
+    def drop_partitions(self):
+        with connection.cursor() as cursor:
+            for table in ENERGY_TABLES:
+                cursor.execute(f'DROP TABLE IF EXISTS {table}_p2001_03')
+
+    def test_rows_move_out_of_the_default_partition(self):
+        timestamp = datetime(2001, 3, 15, tzinfo=dt_timezone.utc)
+        load = LoadData.objects.create(
+            utc_timestamp=timestamp, cet_cest_timestamp=timestamp, country_code='DE', actual_load_mw=1
+        )
+
+        command = ImportOpsdCommand()
+        command.known_partitions = set()
+        command.ensure_month_partitions([200103])
+        # A month that already has its partition is left alone
+        command.known_partitions = set()
+        command.ensure_month_partitions([200103])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT tableoid::regclass::text FROM {ENERGY_TABLES[0]} WHERE id = %s', [load.pk])
+            self.assertEqual(cursor.fetchone()[0], f'{ENERGY_TABLES[0]}_p2001_03')
+            for table in ENERGY_TABLES:
+                cursor.execute('SELECT to_regclass(%s)', [f'{table}_p2001_03'])
+                self.assertIsNotNone(cursor.fetchone()[0])
+
+
+class PartitionMigrationTests(TransactionTestCase):
+    before_partitioning = ('energy_data', '0003_remove_energyprice_energy_data_utc_tim_375bf9_idx_and_more')
+
+    def relkinds(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT relname, relkind FROM pg_class WHERE relname = ANY(%s)', [ENERGY_TABLES])
+            return dict(cursor.fetchall())
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def test_round_trip_keeps_rows_and_ids(self):
+        created = [datetime(2019, 6, 1, tzinfo=dt_timezone.utc), datetime.now(dt_timezone.utc)]
+        for timestamp in created:
+            LoadData.objects.create(
+                utc_timestamp=timestamp, cet_cest_timestamp=timestamp, country_code='DE', actual_load_mw=1
+            )
+        ids = set(LoadData.objects.values_list('id', flat=True))
+
+        try:
+            apps = self.migrate([self.before_partitioning])
+            self.assertEqual(set(self.relkinds().values()), {'r'})
+
+            # Plain tables keep every row and hand out ids past the existing ones
+            HistoricalLoadData = apps.get_model('energy_data', 'LoadData')
+            self.assertEqual(set(HistoricalLoadData.objects.values_list('id', flat=True)), ids)
+            timestamp = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+            added = HistoricalLoadData.objects.create(
+                utc_timestamp=timestamp, cet_cest_timestamp=timestamp, country_code='FR'
+            )
+            self.assertGreater(added.id, max(ids))
+            ids.add(added.id)
+        finally:
+            self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+        self.assertEqual(set(self.relkinds().values()), {'p'})
+        self.assertEqual(set(LoadData.objects.values_list('id', flat=True)), ids)
+        self.assertGreater(LoadData.objects.create(
+            utc_timestamp=timestamp, cet_cest_timestamp=timestamp, country_code='DE'
+        ).id, max(ids))
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM pg_index WHERE NOT indisvalid')
+            self.assertEqual(cursor.fetchone()[0], 0)
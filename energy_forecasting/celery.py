@@ -0,0 +1,15 @@
+"""
+Celery application for energy_forecasting project.
+
+Tasks are discovered from each installed app's ``tasks`` module.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'energy_forecasting.settings')
+
+app = Celery('energy_forecasting')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from datetime import timedelta
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -115,6 +116,8 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD'),
         'HOST': config('POSTGRES_HOST',),
         'PORT': config('POSTGRES_PORT', cast=int),
+        # Keep server-side cursors so QuerySet.iterator() streams large result sets
+        'DISABLE_SERVER_SIDE_CURSORS': False,
     },
 }
 
@@ -131,6 +134,21 @@ CACHES = {
     }
 }
 
+# Celery
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=config('REDIS_LOCATION'))
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_BEAT_SCHEDULE = {
+    'refresh-model-daily-performance': {
+        'task': 'forecasting.tasks.refresh_model_daily_performance',
+        'schedule': crontab(hour=2, minute=0),
+    },
+    'record-model-performance': {
+        'task': 'forecasting.tasks.record_model_performance',
+        'schedule': crontab(hour=2, minute=30),
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
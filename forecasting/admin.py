@@ -1,12 +1,108 @@
+import functools
+
 from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+from django.db.models import Case, DurationField, ExpressionWrapper, F, FloatField, Q, Value, When
+from django.db.models.functions import Abs, Greatest, Now
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import ForecastModel, EnergyForecast, ModelPerformanceMetric
+from energy_data.admin import ChangelistOnlyMixin, CountryCodeFilter, StaticChoiceFilter
+from .models import FORECAST_HORIZON_HOURS, ForecastModel, EnergyForecast, ModelDailyPerformance, ModelPerformanceMetric
+from .paginators import EstimatedCountPaginator, PkSlicePaginator
+
+
+ACTIVE_STATUS = mark_safe('<span style="color: green;">✓ Active</span>')
+INACTIVE_STATUS = mark_safe('<span style="color: red;">✗ Inactive</span>')
+
+
+def colored_percent(color, value, precision):
+    # Colors are fixed literals and the value is a formatted float, so there is nothing to escape
+    return mark_safe(f'<span style="color: {color};">{value:.{precision}f}%</span>')
+
+
+@functools.lru_cache(maxsize=4096)
+def format_performance_summary(mae, rmse):
+    if mae and rmse:
+        return f"MAE: {mae:.2f}, RMSE: {rmse:.2f}"
+    return "-"
+
+
+@functools.lru_cache(maxsize=4096)
+def format_training_period(start, end):
+    if start and end:
+        days = (end - start).days
+        return f"{start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')} ({days} days)"
+    return "-"
+
+
+class ModelCountryCodeFilter(CountryCodeFilter):
+    parameter_name = 'model__country_code'
+
+
+class HorizonHoursFilter(StaticChoiceFilter):
+    title = 'horizon'
+    parameter_name = 'horizon_hours'
+    choices = [(str(hours), f"{hours}h") for hours in FORECAST_HORIZON_HOURS]
+
+
+class ForecastAccuracyMixin:
+    """Compute forecast error and accuracy in the query rather than per object in Python"""
+
+    def get_queryset(self, request):
+        abs_error = Abs(F('predicted_value') - F('actual_value'))
+        return super().get_queryset(request).annotate(
+            _forecast_error=abs_error,
+            _forecast_accuracy=Case(
+                When(
+                    ~Q(actual_value=0),
+                    actual_value__isnull=False,
+                    then=Greatest(Value(0.0), 100 - abs_error * 100.0 / F('actual_value'))
+                ),
+                default=None,
+                output_field=FloatField()
+            )
+        )
+
+    def forecast_error(self, obj):
+        return obj._forecast_error
+
+    forecast_error.short_description = "Forecast error"
+    forecast_error.admin_order_field = '_forecast_error'
+
+    def forecast_accuracy_percent(self, obj):
+        return obj._forecast_accuracy
+
+    forecast_accuracy_percent.short_description = "Forecast accuracy percent"
+    forecast_accuracy_percent.admin_order_field = '_forecast_accuracy'
+
+
+class LatestRowsFormSet(BaseInlineFormSet):
+    """Inline formset showing the first `limit` related rows, sliced after the parent filter so LIMIT reaches SQL"""
+    limit = None
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if not qs.query.is_sliced:
+            qs = self._queryset = qs[:self.limit]
+        return qs
+
+
+class LatestForecastsFormSet(LatestRowsFormSet):
+    limit = 10
 
 
-class EnergyForecastInline(admin.TabularInline):
+class LatestMetricsFormSet(LatestRowsFormSet):
+    limit = 5
+
+
+class LatestDaysFormSet(LatestRowsFormSet):
+    limit = 30
+
+
+class EnergyForecastInline(ForecastAccuracyMixin, admin.TabularInline):
     model = EnergyForecast
+    formset = LatestForecastsFormSet
     extra = 0
     readonly_fields = ['forecast_error', 'forecast_accuracy_percent']
     fields = [
@@ -18,20 +114,47 @@ class EnergyForecastInline(admin.TabularInline):
     ]
 
     def get_queryset(self, request):
-        return super().get_queryset(request).order_by('-target_timestamp')[:10]
+        return super().get_queryset(request).only(
+            'model', 'target_timestamp', 'predicted_value', 'actual_value'
+        ).order_by('-target_timestamp')
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 class ModelPerformanceMetricInline(admin.TabularInline):
     model = ModelPerformanceMetric
+    formset = LatestMetricsFormSet
     extra = 0
     readonly_fields = ['evaluation_date', 'mae', 'rmse', 'mape', 'forecast_count']
 
     def get_queryset(self, request):
-        return super().get_queryset(request).order_by('-evaluation_date')[:5]
+        return super().get_queryset(request).order_by('-evaluation_date')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class ModelDailyPerformanceInline(admin.TabularInline):
+    """Daily error trend from the nightly materialized view, so the change form never aggregates raw forecasts"""
+    model = ModelDailyPerformance
+    formset = LatestDaysFormSet
+    extra = 0
+    fields = readonly_fields = ['day', 'mae', 'rmse', 'forecast_count']
+    verbose_name_plural = "Daily performance (refreshed nightly)"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(ForecastModel)
-class ForecastModelAdmin(admin.ModelAdmin):
+class ForecastModelAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'name',
         'model_type',
@@ -44,13 +167,15 @@ class ForecastModelAdmin(admin.ModelAdmin):
     ]
     list_filter = [
         'model_type',
-        'country_code',
+        CountryCodeFilter,
         'target_variable',
         'is_active',
         ('created_at', admin.DateFieldListFilter),
     ]
     search_fields = ['name', 'country_code', 'target_variable']
     ordering = ['-created_at', 'name']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = [
         'created_at',
         'updated_at',
@@ -58,7 +183,11 @@ class ForecastModelAdmin(admin.ModelAdmin):
         'training_period',
         'forecast_count'
     ]
-    inlines = [ModelPerformanceMetricInline, EnergyForecastInline]
+    inlines = [ModelPerformanceMetricInline, ModelDailyPerformanceInline, EnergyForecastInline]
+    changelist_fields = [
+        'name', 'model_type', 'country_code', 'target_variable', 'version', 'is_active',
+        'created_at', 'mae', 'rmse', 'training_start_date', 'training_end_date'
+    ]
 
     fieldsets = (
         ('Model Information', {
@@ -84,32 +213,22 @@ class ForecastModelAdmin(admin.ModelAdmin):
 
     def is_active_status(self, obj):
         if obj.is_active:
-            return format_html('<span style="color: green;">✓ Active</span>')
+            return ACTIVE_STATUS
         else:
-            return format_html('<span style="color: red;">✗ Inactive</span>')
+            return INACTIVE_STATUS
 
     is_active_status.short_description = "Status"
 
     def performance_summary(self, obj):
-        if obj.mae and obj.rmse:
-            return f"MAE: {obj.mae:.2f}, RMSE: {obj.rmse:.2f}"
-        return "-"
+        return format_performance_summary(obj.mae, obj.rmse)
 
     performance_summary.short_description = "Performance"
 
     def training_period(self, obj):
-        if obj.training_start_date and obj.training_end_date:
-            days = (obj.training_end_date - obj.training_start_date).days
-            return f"{obj.training_start_date.strftime('%Y-%m-%d')} to {obj.training_end_date.strftime('%Y-%m-%d')} ({days} days)"
-        return "-"
+        return format_training_period(obj.training_start_date, obj.training_end_date)
 
     training_period.short_description = "Training Period"
 
-    def forecast_count(self, obj):
-        return obj.forecasts.count()
-
-    forecast_count.short_description = "Total Forecasts"
-
     actions = ['activate_models', 'deactivate_models']
 
     def activate_models(self, request, queryset):
@@ -126,7 +245,7 @@ class ForecastModelAdmin(admin.ModelAdmin):
 
 
 @admin.register(EnergyForecast)
-class EnergyForecastAdmin(admin.ModelAdmin):
+class EnergyForecastAdmin(ForecastAccuracyMixin, ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'model_link',
         'country_code',
@@ -138,20 +257,26 @@ class EnergyForecastAdmin(admin.ModelAdmin):
         'forecast_age'
     ]
     list_filter = [
-        'country_code',
-        'horizon_hours',
+        CountryCodeFilter,
+        HorizonHoursFilter,
         'model__model_type',
         ('target_timestamp', admin.DateFieldListFilter),
     ]
     search_fields = ['model__name', 'country_code']
-    date_hierarchy = 'target_timestamp'
     ordering = ['-target_timestamp', 'country_code']
+    list_select_related = ('model',)
+    paginator = PkSlicePaginator
+    show_full_result_count = False
     readonly_fields = [
         'created_at',
         'forecast_error',
         'forecast_accuracy_percent',
         'forecast_age'
     ]
+    changelist_fields = [
+        'model__name', 'country_code', 'forecast_timestamp', 'target_timestamp',
+        'horizon_hours', 'predicted_value', 'actual_value'
+    ]
 
     fieldsets = (
         ('Forecast Information', {
@@ -172,6 +297,12 @@ class EnergyForecastAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        # One clock reading for the whole page, taken by the database
+        return super().get_queryset(request).annotate(
+            _forecast_age=ExpressionWrapper(Now() - F('forecast_timestamp'), output_field=DurationField())
+        )
+
     def model_link(self, obj):
         url = reverse('admin:forecasting_forecastmodel_change', args=[obj.model.pk])
         return format_html('<a href="{}">{}</a>', url, obj.model.name)
@@ -194,31 +325,28 @@ class EnergyForecastAdmin(admin.ModelAdmin):
     actual_value_formatted.admin_order_field = 'actual_value'
 
     def forecast_accuracy_display(self, obj):
-        accuracy = obj.forecast_accuracy_percent
+        accuracy = obj._forecast_accuracy
         if accuracy is not None:
             color = "green" if accuracy > 95 else "orange" if accuracy > 90 else "red"
-            return format_html(
-                '<span style="color: {};">{:.1f}%</span>',
-                color, accuracy
-            )
+            return colored_percent(color, accuracy, 1)
         return "-"
 
     forecast_accuracy_display.short_description = "Accuracy"
+    forecast_accuracy_display.admin_order_field = '_forecast_accuracy'
 
     def forecast_age(self, obj):
-        from django.utils import timezone
-        age = timezone.now() - obj.forecast_timestamp
-        hours = age.total_seconds() / 3600
+        hours = obj._forecast_age.total_seconds() / 3600
         if hours < 24:
             return f"{hours:.1f}h"
         else:
             return f"{hours / 24:.1f}d"
 
     forecast_age.short_description = "Age"
+    forecast_age.admin_order_field = '-forecast_timestamp'
 
 
 @admin.register(ModelPerformanceMetric)
-class ModelPerformanceMetricAdmin(admin.ModelAdmin):
+class ModelPerformanceMetricAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = [
         'model_link',
         'evaluation_date',
@@ -229,15 +357,20 @@ class ModelPerformanceMetricAdmin(admin.ModelAdmin):
         'forecast_count'
     ]
     list_filter = [
-        'model__country_code',
+        ModelCountryCodeFilter,
         'model__model_type',
         ('evaluation_date', admin.DateFieldListFilter),
         'evaluation_period_days'
     ]
     search_fields = ['model__name']
-    date_hierarchy = 'evaluation_date'
     ordering = ['-evaluation_date', 'model__name']
+    list_select_related = ('model',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = ['created_at']
+    changelist_fields = [
+        'model__name', 'evaluation_date', 'evaluation_period_days', 'mae', 'rmse', 'mape', 'forecast_count'
+    ]
 
     def model_link(self, obj):
         url = reverse('admin:forecasting_forecastmodel_change', args=[obj.model.pk])
@@ -248,10 +381,7 @@ class ModelPerformanceMetricAdmin(admin.ModelAdmin):
 
     def mape_formatted(self, obj):
         color = "green" if obj.mape < 5 else "orange" if obj.mape < 10 else "red"
-        return format_html(
-            '<span style="color: {};">{:.2f}%</span>',
-            color, obj.mape
-        )
+        return colored_percent(color, obj.mape, 2)
 
     mape_formatted.short_description = "MAPE"
     mape_formatted.admin_order_field = 'mape'
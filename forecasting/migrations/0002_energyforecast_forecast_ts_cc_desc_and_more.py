@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('forecasting', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='energyforecast',
+            index=models.Index(fields=['-target_timestamp', 'country_code'], name='forecast_ts_cc_desc'),
+        ),
+        AddIndexConcurrently(
+            model_name='modelperformancemetric',
+            index=models.Index(fields=['-evaluation_date', 'model'], name='forecasting_evaluat_08c007_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:05
+
+from django.db import migrations, models
+
+# Statement-level triggers with transition tables, so a bulk insert of
+# forecasts touches each parent model row once rather than once per forecast
+FORECAST_COUNT_TRIGGERS = """
+CREATE FUNCTION forecasting_forecast_count_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count - d.n
+        FROM (SELECT model_id, count(*) AS n FROM old_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count + d.n
+        FROM (SELECT model_id, count(*) AS n FROM new_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER energyforecast_count_insert
+    AFTER INSERT ON forecasting_energyforecast
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION forecasting_forecast_count_sync();
+
+CREATE TRIGGER energyforecast_count_update
+    AFTER UPDATE ON forecasting_energyforecast
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION forecasting_forecast_count_sync();
+
+CREATE TRIGGER energyforecast_count_delete
+    AFTER DELETE ON forecasting_energyforecast
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION forecasting_forecast_count_sync();
+
+UPDATE forecasting_forecastmodel m
+SET forecast_count = (SELECT count(*) FROM forecasting_energyforecast f WHERE f.model_id = m.id);
+"""
+
+DROP_FORECAST_COUNT_TRIGGERS = """
+DROP TRIGGER energyforecast_count_insert ON forecasting_energyforecast;
+DROP TRIGGER energyforecast_count_update ON forecasting_energyforecast;
+DROP TRIGGER energyforecast_count_delete ON forecasting_energyforecast;
+DROP FUNCTION forecasting_forecast_count_sync();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0002_energyforecast_forecast_ts_cc_desc_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forecastmodel',
+            name='forecast_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(FORECAST_COUNT_TRIGGERS, DROP_FORECAST_COUNT_TRIGGERS),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:08
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('forecasting', '0003_forecastmodel_forecast_count'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='energyforecast',
+            index=models.Index(condition=models.Q(('actual_value__isnull', True)), fields=['model', 'target_timestamp'], name='forecast_pending_actual_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='forecastmodel',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['country_code', 'created_at'], name='fm_active_idx'),
+        ),
+    ]
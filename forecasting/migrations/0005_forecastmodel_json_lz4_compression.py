@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# lz4 packs these blobs tighter than the default pglz and decompresses
+# several times faster when a change form does read them
+JSON_COLUMNS = ['parameters', 'feature_columns']
+
+
+def set_compression(schema_editor, method):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_settings WHERE name = 'default_toast_compression' AND 'lz4' = ANY(enumvals)")
+        if cursor.fetchone() is None:
+            # Server built without lz4 (or older than Postgres 14)
+            return
+        for column in JSON_COLUMNS:
+            cursor.execute(f'ALTER TABLE forecasting_forecastmodel ALTER COLUMN {column} SET COMPRESSION {method}')
+
+
+def use_lz4(apps, schema_editor):
+    set_compression(schema_editor, 'lz4')
+
+
+def use_pglz(apps, schema_editor):
+    set_compression(schema_editor, 'pglz')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0004_energyforecast_forecast_pending_actual_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_lz4, use_pglz),
+    ]
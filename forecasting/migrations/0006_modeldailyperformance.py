@@ -0,0 +1,54 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:10
+
+from django.db import migrations, models
+
+CREATE_DAILY_PERFORMANCE_VIEW = """
+CREATE MATERIALIZED VIEW mv_model_daily_perf AS
+SELECT
+    row_number() OVER (ORDER BY model_id, day) AS id,
+    model_id,
+    day,
+    mae,
+    rmse,
+    forecast_count
+FROM (
+    SELECT
+        model_id,
+        (target_timestamp AT TIME ZONE 'UTC')::date AS day,
+        avg(abs(predicted_value - actual_value)) AS mae,
+        sqrt(avg(power(predicted_value - actual_value, 2))) AS rmse,
+        count(*) AS forecast_count
+    FROM forecasting_energyforecast
+    WHERE actual_value IS NOT NULL
+    GROUP BY 1, 2
+) daily;
+
+-- REFRESH ... CONCURRENTLY needs a unique index on plain columns
+CREATE UNIQUE INDEX mv_model_daily_perf_model_day ON mv_model_daily_perf (model_id, day DESC);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0005_forecastmodel_json_lz4_compression'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelDailyPerformance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('mae', models.FloatField()),
+                ('rmse', models.FloatField()),
+                ('forecast_count', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'mv_model_daily_perf',
+                'ordering': ['-day'],
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_DAILY_PERFORMANCE_VIEW, 'DROP MATERIALIZED VIEW mv_model_daily_perf'),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:11
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0006_modeldailyperformance'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='energyforecast',
+            name='target_timestamp',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='energyforecast',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['target_timestamp'], name='forecast_target_ts_brin', pages_per_range=32),
+        ),
+    ]
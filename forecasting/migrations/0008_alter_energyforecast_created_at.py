@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:12
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0007_alter_energyforecast_target_timestamp_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='energyforecast',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# UPDATEs only change a count when a forecast moves to another model, so the
+# update branch nets old_rows against new_rows and leaves unchanged models
+# alone; backfilling actual_value or an upsert conflict no longer rewrites
+# (and row-locks) the parent ForecastModel rows
+NET_FORECAST_COUNT_SYNC = """
+CREATE OR REPLACE FUNCTION forecasting_forecast_count_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count + d.n
+        FROM (SELECT model_id, count(*) AS n FROM new_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count - d.n
+        FROM (SELECT model_id, count(*) AS n FROM old_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    ELSE
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count + d.delta
+        FROM (
+            SELECT model_id, sum(delta) AS delta
+            FROM (
+                SELECT o.model_id, -1 AS delta
+                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                WHERE n.model_id <> o.model_id
+                UNION ALL
+                SELECT n.model_id, 1
+                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                WHERE n.model_id <> o.model_id
+            ) moved
+            GROUP BY model_id
+        ) d
+        WHERE m.id = d.model_id AND d.delta <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# The function as migration 0003 created it
+SUBTRACT_ADD_FORECAST_COUNT_SYNC = """
+CREATE OR REPLACE FUNCTION forecasting_forecast_count_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count - d.n
+        FROM (SELECT model_id, count(*) AS n FROM old_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE forecasting_forecastmodel m
+        SET forecast_count = m.forecast_count + d.n
+        FROM (SELECT model_id, count(*) AS n FROM new_rows GROUP BY model_id) d
+        WHERE m.id = d.model_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0008_alter_energyforecast_created_at'),
+    ]
+
+    operations = [
+        migrations.RunSQL(NET_FORECAST_COUNT_SYNC, SUBTRACT_ADD_FORECAST_COUNT_SYNC),
+    ]
@@ -1,4 +1,12 @@
+import numpy as np
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
+from django.db.models.functions import Now
+from django.utils.functional import cached_property
+
+# Standard forecast horizons, in hours ahead
+FORECAST_HORIZON_HOURS = (1, 6, 12, 24, 48)
+
 
 class ForecastModel(models.Model):
     """ML model metadata and performance tracking"""
@@ -36,22 +44,52 @@ class ForecastModel(models.Model):
     is_active = models.BooleanField(default=True)
     model_file_path = models.CharField(max_length=255, null=True, blank=True)
 
+    # Maintained by database triggers on EnergyForecast (see migrations 0003 and 0009)
+    forecast_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['country_code', 'created_at'], condition=models.Q(is_active=True), name='fm_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} v{self.version} ({self.country_code})"
 
+    def save(self, *args, update_fields=None, **kwargs):
+        # forecast_count belongs to the triggers; never write back the copy loaded with this instance
+        if update_fields is None and not self._state.adding:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'forecast_count'
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class EnergyForecastManager(models.Manager):
+    def bulk_upsert(self, objs, batch_size=1000):
+        """Insert forecasts in multi-row batches, overwriting predictions already stored for a target"""
+        return self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['model', 'target_timestamp'],
+            update_fields=[
+                'forecast_timestamp', 'horizon_hours', 'predicted_value',
+                'confidence_lower', 'confidence_upper', 'actual_value'
+            ]
+        )
+
 
 class EnergyForecast(models.Model):
     """Energy demand/generation predictions"""
     model = models.ForeignKey(ForecastModel, on_delete=models.CASCADE, related_name='forecasts')
     country_code = models.CharField(max_length=10, db_index=True)
     forecast_timestamp = models.DateTimeField(db_index=True)  # When prediction was made
-    target_timestamp = models.DateTimeField(db_index=True)  # What time prediction is for
+    target_timestamp = models.DateTimeField()  # What time prediction is for
 
     # Prediction results
     predicted_value = models.FloatField()
@@ -64,22 +102,32 @@ class EnergyForecast(models.Model):
     # Forecast horizon
     horizon_hours = models.PositiveIntegerField()  # 1, 6, 12, 24, 48 hours ahead
 
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    objects = EnergyForecastManager()
 
     class Meta:
         unique_together = ['model', 'target_timestamp']
         indexes = [
             models.Index(fields=['country_code', 'target_timestamp']),
             models.Index(fields=['forecast_timestamp']),
+            models.Index(fields=['-target_timestamp', 'country_code'], name='forecast_ts_cc_desc'),
+            BrinIndex(fields=['target_timestamp'], pages_per_range=32, name='forecast_target_ts_brin'),
+            # Forecasts still waiting for their actual value
+            models.Index(
+                fields=['model', 'target_timestamp'],
+                condition=models.Q(actual_value__isnull=True),
+                name='forecast_pending_actual_idx'
+            ),
         ]
 
-    @property
+    @cached_property
     def forecast_error(self):
         if self.actual_value is not None:
             return abs(self.predicted_value - self.actual_value)
         return None
 
-    @property
+    @cached_property
     def forecast_accuracy_percent(self):
         if self.actual_value is not None and self.actual_value != 0:
             error_percent = abs(self.predicted_value - self.actual_value) / self.actual_value * 100
@@ -104,3 +152,52 @@ class ModelPerformanceMetric(models.Model):
     class Meta:
         unique_together = ['model', 'evaluation_date']
         ordering = ['-evaluation_date']
+        indexes = [
+            models.Index(fields=['-evaluation_date', 'model']),
+        ]
+
+    @classmethod
+    def compute_for(cls, model, start, end):
+        """Build an unsaved metric from the model's evaluated forecasts between two datetimes, or None if MAPE is undefined"""
+        rows = EnergyForecast.objects.filter(
+            model=model,
+            target_timestamp__range=(start, end),
+            actual_value__isnull=False
+        ).values_list('predicted_value', 'actual_value').iterator()
+        values = np.fromiter(rows, dtype=[('predicted', 'f8'), ('actual', 'f8')])
+
+        # Zero actuals have no percentage error and are left out of MAPE; with no
+        # other rows there is nothing to store in the non-null mape column
+        nonzero = values['actual'] != 0
+        if not nonzero.any():
+            return None
+
+        error = values['predicted'] - values['actual']
+        abs_error = np.abs(error)
+        mape = (abs_error[nonzero] / np.abs(values['actual'][nonzero])).mean() * 100
+
+        return cls(
+            model=model,
+            evaluation_date=end.date(),
+            evaluation_period_days=(end - start).days,
+            mae=float(abs_error.mean()),
+            rmse=float(np.sqrt((error * error).mean())),
+            mape=float(mape),
+            forecast_count=len(values)
+        )
+
+
+class ModelDailyPerformance(models.Model):
+    """Per-model daily error aggregates, read from a materialized view refreshed nightly"""
+    model = models.ForeignKey(
+        ForecastModel, on_delete=models.DO_NOTHING, related_name='daily_performance', db_constraint=False
+    )
+    day = models.DateField()
+    mae = models.FloatField()
+    rmse = models.FloatField()
+    forecast_count = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_model_daily_perf'
+        ordering = ['-day']
@@ -0,0 +1,81 @@
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that reads the planner's row estimate instead of COUNT(*) on unfiltered lists"""
+
+    # Below this many rows an exact count is cheap and the estimate too coarse
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
+
+    def estimated_count(self):
+        queryset = self.object_list
+        # Filters and search both end up in the WHERE clause; only the bare table can be estimated
+        if not hasattr(queryset, 'query') or queryset.query.where:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
+
+
+class PkSlicePage(Page):
+    """Page that knows from its own rows whether another page follows"""
+
+    def __init__(self, object_list, number, paginator, has_more=False):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class PkSlicePaginator(EstimatedCountPaginator):
+    """Paginator that walks the offset over primary keys only, then loads full rows for the page"""
+
+    def validate_number(self, number):
+        # num_pages may rest on a low estimate, so later pages are let through here
+        # and page() rejects them once they turn out to be empty
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # The count may be an estimate, so whether this is the last page is read from
+        # the rows: up to orphans more are folded in, and one pk beyond that means more follow
+        top = bottom + self.per_page + self.orphans
+        pks = list(self.object_list.values_list('pk', flat=True)[bottom:top + 1])
+        if not pks and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        has_more = len(pks) > self.per_page + self.orphans
+        if has_more:
+            pks = pks[:self.per_page]
+        return self._get_page(self.object_list.filter(pk__in=pks), number, self, has_more=has_more)
+
+    def _get_page(self, *args, **kwargs):
+        return PkSlicePage(*args, **kwargs)
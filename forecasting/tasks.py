@@ -0,0 +1,38 @@
+# forecasting/tasks.py
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.db import connection
+from django.utils import timezone
+
+from forecasting.models import ForecastModel, ModelDailyPerformance, ModelPerformanceMetric
+
+
+@shared_task
+def refresh_model_daily_performance():
+    """Rebuild the daily performance view without blocking admin reads"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {ModelDailyPerformance._meta.db_table}')
+
+
+@shared_task
+def record_model_performance(period_days=30):
+    """Store each active model's errors over the last period_days as today's performance metric"""
+    end = timezone.now()
+    start = end - timedelta(days=period_days)
+
+    metrics = [
+        metric for metric in (
+            ModelPerformanceMetric.compute_for(model, start, end)
+            for model in ForecastModel.objects.filter(is_active=True)
+        )
+        if metric is not None
+    ]
+    ModelPerformanceMetric.objects.bulk_create(
+        metrics,
+        update_conflicts=True,
+        unique_fields=['model', 'evaluation_date'],
+        update_fields=['evaluation_period_days', 'mae', 'rmse', 'mape', 'forecast_count']
+    )
+    return len(metrics)
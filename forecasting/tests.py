@@ -1,3 +1,194 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.paginator import EmptyPage
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from forecasting.models import EnergyForecast, ForecastModel, ModelPerformanceMetric
+from forecasting.paginators import EstimatedCountPaginator, PkSlicePaginator
+from forecasting.tasks import record_model_performance
+
+
+def create_forecast_models(count, **kwargs):
+    """Create count ForecastModel rows named model-000, model-001, ..."""
+    training_date = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+    return ForecastModel.objects.bulk_create([
+        ForecastModel(
+            name=f'model-{i:03d}', model_type='linear_regression', country_code='DE',
+            target_variable='load', training_start_date=training_date, training_end_date=training_date,
+            **kwargs
+        )
+        for i in range(count)
+    ])
+
+
+def build_forecasts(model, count, start=datetime(2024, 6, 1, tzinfo=dt_timezone.utc), **kwargs):
+    """Build count unsaved hourly forecasts for model starting at start"""
+    return [
+        EnergyForecast(
+            model=model, country_code=model.country_code, forecast_timestamp=start,
+            target_timestamp=start + timedelta(hours=i), horizon_hours=1,
+            **{'predicted_value': 100.0, **kwargs}
+        )
+        for i in range(count)
+    ]
+
+
+def estimating_paginator(paginator_class, estimate):
+    """Subclass paginator_class to report a fixed planner estimate, however few rows there are"""
+    return type('Estimating' + paginator_class.__name__, (paginator_class,), {
+        'exact_count_threshold': 0,
+        'estimated_count': lambda self: estimate,
+    })
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def test_small_and_filtered_lists_are_counted_exactly(self):
+        create_forecast_models(3)
+        queryset = ForecastModel.objects.order_by('name')
+
+        self.assertEqual(EstimatedCountPaginator(queryset, 2).count, 3)
+        self.assertIsNone(EstimatedCountPaginator(queryset.filter(country_code='DE'), 2).estimated_count())
+
+    def test_estimate_is_used_above_threshold(self):
+        create_forecast_models(3)
+        paginator_class = estimating_paginator(EstimatedCountPaginator, 500)
+
+        self.assertEqual(paginator_class(ForecastModel.objects.order_by('name'), 2).count, 500)
+
+
+class PkSlicePaginatorTests(TestCase):
+    per_page = 5
+    orphans = 2
+
+    def setUp(self):
+        create_forecast_models(23)
+        self.queryset = ForecastModel.objects.order_by('name')
+        self.expected = list(self.queryset.values_list('name', flat=True))
+
+    def walk_pages(self, estimate):
+        """Follow has_next from the first page, returning the names of every row seen"""
+        paginator = estimating_paginator(PkSlicePaginator, estimate)(
+            self.queryset, self.per_page, orphans=self.orphans
+        )
+        names, number = [], 1
+        while True:
+            page = paginator.page(number)
+            self.assertLessEqual(len(page), self.per_page + self.orphans)
+            names += [model.name for model in page]
+            if not page.has_next():
+                return paginator, number, names
+            number += 1
+
+    def test_exact_count_pages_like_django(self):
+        paginator, last, names = self.walk_pages(23)
+
+        self.assertEqual(names, self.expected)
+        self.assertEqual(last, paginator.num_pages)
+
+    def test_low_estimate_keeps_later_rows_reachable_and_pages_bounded(self):
+        paginator, last, names = self.walk_pages(12)
+
+        self.assertEqual(names, self.expected)
+        self.assertGreater(last, paginator.num_pages)
+
+    def test_high_estimate_ends_at_the_last_real_page(self):
+        paginator, last, names = self.walk_pages(200)
+
+        self.assertEqual(names, self.expected)
+        with self.assertRaises(EmptyPage):
+            paginator.page(last + 1)
+
+
+class ForecastCountTriggerTests(TestCase):
+    def setUp(self):
+        self.model, self.other_model = create_forecast_models(2)
+
+    def assertCounts(self, *counts):
+        self.assertEqual(
+            [ForecastModel.objects.get(pk=model.pk).forecast_count for model in (self.model, self.other_model)],
+            list(counts)
+        )
+
+    def row_version(self, model):
+        # Every UPDATE writes a new tuple, so an unchanged ctid means the row was left alone
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT ctid::text FROM forecasting_forecastmodel WHERE id = %s', [model.pk])
+            return cursor.fetchone()[0]
+
+    def test_inserts_and_deletes_are_counted(self):
+        EnergyForecast.objects.bulk_create(build_forecasts(self.model, 3) + build_forecasts(self.other_model, 2))
+        self.assertCounts(3, 2)
+
+        EnergyForecast.objects.filter(model=self.model).first().delete()
+        self.assertCounts(2, 2)
+
+    def test_updates_that_keep_the_model_leave_the_parent_row_alone(self):
+        EnergyForecast.objects.bulk_create(build_forecasts(self.model, 3))
+        version = self.row_version(self.model)
+
+        EnergyForecast.objects.filter(model=self.model).update(actual_value=95.0)
+        EnergyForecast.objects.bulk_upsert(build_forecasts(self.model, 3, predicted_value=110.0))
+
+        self.assertEqual(self.row_version(self.model), version)
+        self.assertCounts(3, 0)
+
+    def test_moving_forecasts_between_models_moves_the_count(self):
+        forecasts = EnergyForecast.objects.bulk_create(build_forecasts(self.model, 3))
+
+        EnergyForecast.objects.filter(pk__in=[forecast.pk for forecast in forecasts[:2]]).update(
+            model=self.other_model
+        )
+
+        self.assertCounts(1, 2)
+
+
+class ModelPerformanceMetricTests(TestCase):
+    start = datetime(2024, 6, 1, tzinfo=dt_timezone.utc)
+    end = datetime(2024, 7, 1, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        self.model, = create_forecast_models(1)
+
+    def create_forecasts(self, pairs):
+        forecasts = build_forecasts(self.model, len(pairs))
+        for forecast, (predicted, actual) in zip(forecasts, pairs):
+            forecast.predicted_value, forecast.actual_value = predicted, actual
+        EnergyForecast.objects.bulk_create(forecasts)
+
+    def test_errors_over_evaluated_forecasts(self):
+        self.create_forecasts([(110.0, 100.0), (90.0, 100.0), (100.0, 0.0), (120.0, None)])
+
+        metric = ModelPerformanceMetric.compute_for(self.model, self.start, self.end)
+
+        self.assertEqual(metric.forecast_count, 3)
+        self.assertEqual(metric.mae, 40.0)
+        self.assertAlmostEqual(metric.rmse, ((100 + 100 + 10000) / 3) ** 0.5)
+        # The zero actual is left out of MAPE
+        self.assertAlmostEqual(metric.mape, 10.0)
+        self.assertEqual((metric.evaluation_date, metric.evaluation_period_days), (self.end.date(), 30))
+
+    def test_errors_keep_double_precision(self):
+        self.create_forecasts([(100.1, 100.0)])
+
+        metric = ModelPerformanceMetric.compute_for(self.model, self.start, self.end)
+
+        self.assertEqual(metric.mae, 100.1 - 100.0)
+
+    def test_no_metric_without_a_nonzero_actual(self):
+        self.assertIsNone(ModelPerformanceMetric.compute_for(self.model, self.start, self.end))
+
+        self.create_forecasts([(5.0, 0.0), (3.0, 0.0)])
+        self.assertIsNone(ModelPerformanceMetric.compute_for(self.model, self.start, self.end))
+
+    def test_task_records_todays_metric_once(self):
+        now = datetime.now(dt_timezone.utc)
+        forecasts = build_forecasts(self.model, 2, start=now - timedelta(days=1), actual_value=100.0)
+        EnergyForecast.objects.bulk_create(forecasts)
+
+        self.assertEqual(record_model_performance(), 1)
+        EnergyForecast.objects.filter(model=self.model).update(predicted_value=104.0)
+        self.assertEqual(record_model_performance(), 1)
+
+        metric = ModelPerformanceMetric.objects.get(model=self.model)
+        self.assertEqual((metric.mae, metric.forecast_count), (4.0, 2))
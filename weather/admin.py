@@ -1,7 +1,40 @@
+import functools
+
 from django.contrib import admin
+from django.db.models import DurationField, ExpressionWrapper, F
+from django.db.models.functions import Now
 from django.utils.html import format_html
+from energy_data.admin import COUNTRY_CODES, CountryCodeFilter, StaticChoiceFilter
+from forecasting.models import FORECAST_HORIZON_HOURS
+from forecasting.paginators import EstimatedCountPaginator, PkSlicePaginator
 from .models import WeatherData, WeatherForecast
 
+
+@functools.lru_cache(maxsize=4096)
+def format_weather_summary(temperature, wind_speed, humidity):
+    summary = []
+    if temperature:
+        summary.append(f"{temperature}°C")
+    if wind_speed:
+        summary.append(f"{wind_speed}m/s wind")
+    if humidity:
+        summary.append(f"{humidity}% humidity")
+    return ", ".join(summary) if summary else "-"
+
+
+class LocationFilter(StaticChoiceFilter):
+    title = 'location'
+    parameter_name = 'location'
+    # Imports store one country-level average series per country
+    choices = [(f"{code} Average", f"{code} Average") for code in COUNTRY_CODES]
+
+
+class ForecastHorizonFilter(StaticChoiceFilter):
+    title = 'forecast horizon'
+    parameter_name = 'forecast_horizon_hours'
+    choices = [(str(hours), f"{hours}h") for hours in FORECAST_HORIZON_HOURS]
+
+
 @admin.register(WeatherData)
 class WeatherDataAdmin(admin.ModelAdmin):
     list_display = [
@@ -14,14 +47,14 @@ class WeatherDataAdmin(admin.ModelAdmin):
         'weather_summary'
     ]
     list_filter = [
-        'country_code',
-        'location',
+        CountryCodeFilter,
         ('timestamp', admin.DateFieldListFilter),
     ]
-    search_fields = ['location', 'country_code']
-    date_hierarchy = 'timestamp'
-    ordering = ['-timestamp', 'country_code', 'location']
-    readonly_fields = ['created_at', 'weather_summary']
+    search_fields = ['country_code']
+    ordering = ['-timestamp', 'country_code']
+    paginator = PkSlicePaginator
+    show_full_result_count = False
+    readonly_fields = ['location', 'created_at', 'weather_summary']
 
     fieldsets = (
         ('Location & Time', {
@@ -46,14 +79,7 @@ class WeatherDataAdmin(admin.ModelAdmin):
     )
 
     def weather_summary(self, obj):
-        summary = []
-        if obj.temperature_celsius:
-            summary.append(f"{obj.temperature_celsius}°C")
-        if obj.wind_speed_ms:
-            summary.append(f"{obj.wind_speed_ms}m/s wind")
-        if obj.humidity_percent:
-            summary.append(f"{obj.humidity_percent}% humidity")
-        return ", ".join(summary) if summary else "-"
+        return format_weather_summary(obj.temperature_celsius, obj.wind_speed_ms, obj.humidity_percent)
 
     weather_summary.short_description = "Weather Summary"
 
@@ -70,22 +96,28 @@ class WeatherForecastAdmin(admin.ModelAdmin):
         'forecast_age'
     ]
     list_filter = [
-        'country_code',
-        'location',
-        'forecast_horizon_hours',
+        CountryCodeFilter,
+        LocationFilter,
+        ForecastHorizonFilter,
         ('target_timestamp', admin.DateFieldListFilter),
     ]
     search_fields = ['location', 'country_code']
-    date_hierarchy = 'target_timestamp'
     ordering = ['-target_timestamp', 'forecast_horizon_hours']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # One clock reading for the whole page, taken by the database
+        return super().get_queryset(request).annotate(
+            _forecast_age=ExpressionWrapper(Now() - F('forecast_timestamp'), output_field=DurationField())
+        )
 
     def forecast_age(self, obj):
-        from django.utils import timezone
-        age = timezone.now() - obj.forecast_timestamp
-        hours = age.total_seconds() / 3600
+        hours = obj._forecast_age.total_seconds() / 3600
         if hours < 24:
             return f"{hours:.1f}h old"
         else:
             return f"{hours / 24:.1f}d old"
 
     forecast_age.short_description = "Forecast Age"
+    forecast_age.admin_order_field = '-forecast_timestamp'
@@ -1,16 +1,83 @@
 # weather/management/commands/import_weather_data.py
 
+import io
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models.base import ModelState
 from django.utils import timezone
+from psycopg2.extras import execute_values
 from datetime import datetime
 import pytz
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 import logging
 
+from energy_data.indexes import secondary_indexes_dropped
 from weather.models import WeatherData
 
+# COUNTRY_variable columns, with the mapping key each variable is stored under
+WEATHER_COLUMN_PATTERN = re.compile(
+    r'^(?P<country>[^_]+)_(?P<variable>temperature|radiation_direct_horizontal|radiation_diffuse_horizontal)$'
+)
+WEATHER_VARIABLES = {
+    'temperature': 'temperature',
+    'radiation_direct_horizontal': 'radiation_direct',
+    'radiation_diffuse_horizontal': 'radiation_diffuse',
+}
+
+
+def widen_float32(values) -> np.ndarray:
+    """Widen float32 values to float64 through their shortest repr, so 5.3 stays 5.3"""
+    return np.asarray(values, dtype=np.float32).astype(str).astype(np.float64)
+
+
+# Module level so --workers processes can run it
+def build_weather_records(df: pd.DataFrame, countries: List[Tuple[str, ...]]) -> pd.DataFrame:
+    """Turn a batch of wide CSV rows into one WeatherData row per country and timestamp"""
+    if not countries:
+        return pd.DataFrame()
+
+    country_codes, temperature_cols, direct_cols, diffuse_cols = zip(*countries)
+
+    def variable_matrix(columns):
+        # Rows x countries; countries without the variable keep an all-NaN column
+        matrix = np.full((len(df), len(columns)), np.nan, dtype=np.float32)
+        present = [i for i, column in enumerate(columns) if column]
+        if present:
+            matrix[:, present] = df[[columns[i] for i in present]].to_numpy(dtype=np.float32)
+        return matrix
+
+    temperature = variable_matrix(temperature_cols)
+    direct_rad = variable_matrix(direct_cols)
+    diffuse_rad = variable_matrix(diffuse_cols)
+
+    # Each array is scanned for NaN once; the masks feed both the sum and the keep mask
+    direct_missing = np.isnan(direct_rad)
+    diffuse_missing = np.isnan(diffuse_rad)
+    solar_missing = direct_missing & diffuse_missing
+
+    # Total horizontal irradiance is direct + diffuse, or whichever component is present
+    solar_irradiance = np.where(direct_missing, 0, direct_rad) + np.where(diffuse_missing, 0, diffuse_rad)
+    solar_irradiance[solar_missing] = np.nan
+
+    # Skip timestamps with no data available for a country, then flatten wide to long
+    keep = ~(np.isnan(temperature) & solar_missing)
+    rows, cols = np.nonzero(keep)
+
+    return pd.DataFrame({
+        'timestamp': df['utc_timestamp'].array[rows],
+        'country_code': np.array(country_codes, dtype=object)[cols],
+        'temperature_celsius': temperature[keep],
+        'solar_irradiance_wm2': solar_irradiance[keep],
+    })
+
 
 class Command(BaseCommand):
     help = 'Import Open Power System Weather Data from CSV file'
@@ -47,32 +114,83 @@ class Command(BaseCommand):
             type=str,
             help='Comma-separated list of country codes to import (e.g., DE,FR,GB). If not provided, imports all countries.'
         )
+        parser.add_argument(
+            '--disable-indexes',
+            action='store_true',
+            help='Drop secondary indexes during the import and rebuild them afterwards (PostgreSQL only)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes building batch records while the main process writes them (default: 1)'
+        )
+        parser.add_argument(
+            '--insert-method',
+            choices=['copy', 'values'],
+            default='copy',
+            help='How batches are written on PostgreSQL: COPY through a staging table, '
+                 'or multi-row INSERT ... VALUES statements (default: copy)'
+        )
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
         batch_size = options['batch_size']
         dry_run = options['dry_run']
+        self.insert_method = options['insert_method']
 
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be saved'))
 
         try:
-            # Read and process CSV
+            # Only the header is needed to validate and map the columns
             self.stdout.write('Reading weather CSV file...')
-            df = self.read_csv_file(csv_file, options)
+            header = self.read_csv_header(csv_file)
 
             # Validate data structure
-            self.validate_csv_structure(df)
+            self.validate_csv_structure(header)
 
             # Parse columns to understand data structure
-            column_mapping = self.parse_weather_columns(df, options.get('countries'))
-
-            # Import weather data
-            import_stats = self.import_weather_data(df, column_mapping, batch_size, dry_run)
+            column_mapping = self.parse_weather_columns(header, options.get('countries'))
+
+            # With a countries filter, let the CSV parser skip every other country's columns
+            usecols = None
+            if options.get('countries'):
+                usecols = ['utc_timestamp'] + [
+                    column for variables in column_mapping.values()
+                    for column in variables.values() if column
+                ]
+
+            # Sensor readings are low precision, so float32 halves memory at no real cost.
+            # Only the mapped weather columns are pinned; any other column keeps its inferred type.
+            dtype = {
+                column: np.float32
+                for variables in column_mapping.values() for column in variables.values() if column
+            }
+
+            disable_indexes = options['disable_indexes'] and not dry_run and connection.vendor == 'postgresql'
+            if options['disable_indexes'] and not disable_indexes:
+                self.stdout.write(self.style.WARNING(
+                    '--disable-indexes is ignored for dry runs and non-PostgreSQL databases'
+                ))
+
+            # Rebuilt CONCURRENTLY once the import has committed, so writers aren't blocked
+            indexes_dropped = (
+                secondary_indexes_dropped([WeatherData._meta.db_table], self.stdout, concurrently=True)
+                if disable_indexes else nullcontext()
+            )
+            with indexes_dropped:
+                # Import weather data while the rest of the file streams in. The whole
+                # import is one transaction; each batch is a savepoint within it.
+                chunks = self.read_csv_file(csv_file, options, batch_size, usecols, dtype)
+                with nullcontext() if dry_run else transaction.atomic():
+                    import_stats = self.import_weather_data(
+                        chunks, column_mapping, batch_size, dry_run, options['workers']
+                    )
 
             # Log import results (if not dry run)
             if not dry_run:
-                self.log_import_results(csv_file, df, import_stats)
+                self.log_import_results(csv_file, import_stats)
 
             self.stdout.write(
                 self.style.SUCCESS(f'Weather import completed: {import_stats}')
@@ -84,31 +202,49 @@ class Command(BaseCommand):
             )
             raise CommandError(f'Weather import failed: {str(e)}')
 
-    def read_csv_file(self, csv_file: str, options: dict) -> pd.DataFrame:
-        """Read and filter CSV file"""
+    def read_csv_header(self, csv_file: str) -> pd.DataFrame:
+        """Read just the CSV header as an empty DataFrame"""
         try:
-            # Read CSV with pandas - handle timezone properly
-            df = pd.read_csv(csv_file)
-
-            # Parse timestamp column manually to handle timezone issues
-            df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-
-            # Filter by date range if provided
-            if options.get('start_date'):
-                start_date = pd.to_datetime(options['start_date'], utc=True)
-                df = df[df['utc_timestamp'] >= start_date]
+            return pd.read_csv(csv_file, nrows=0)
+        except FileNotFoundError:
+            raise CommandError(f'Weather CSV file not found: {csv_file}')
+        except Exception as e:
+            raise CommandError(f'Error reading weather CSV: {str(e)}')
 
-            if options.get('end_date'):
-                end_date = pd.to_datetime(options['end_date'], utc=True)
-                df = df[df['utc_timestamp'] <= end_date]
+    def read_csv_file(self, csv_file: str, options: dict, batch_size: int,
+                      usecols: List[str] = None, dtype: dict = None) -> Iterator[pd.DataFrame]:
+        """Stream the CSV in batch_size chunks, filtered to the requested date range"""
+        # Naive UTC datetime64 bounds, so the per-chunk filter is a plain int64 comparison
+        start_date = end_date = None
+        if options.get('start_date'):
+            start_date = pd.to_datetime(options['start_date'], utc=True).tz_localize(None).to_datetime64()
+        if options.get('end_date'):
+            end_date = pd.to_datetime(options['end_date'], utc=True).tz_localize(None).to_datetime64()
 
-            self.stdout.write(f'Loaded {len(df)} rows from weather CSV')
-            self.stdout.write(f'Date range: {df["utc_timestamp"].min()} to {df["utc_timestamp"].max()}')
-            return df
+        try:
+            with pd.read_csv(csv_file, usecols=usecols, dtype=dtype, parse_dates=['utc_timestamp'],
+                             date_format='ISO8601', chunksize=batch_size) as reader:
+                for chunk in reader:
+                    # Timestamps without an offset are taken as UTC, as the column name says
+                    if chunk['utc_timestamp'].dt.tz is None:
+                        chunk['utc_timestamp'] = chunk['utc_timestamp'].dt.tz_localize('UTC')
+
+                    # Drop rows outside the date range before they reach the import
+                    if start_date is not None or end_date is not None:
+                        timestamps = chunk['utc_timestamp'].to_numpy(dtype='datetime64[ns]')
+                        in_range = np.ones(len(chunk), dtype=bool)
+                        if start_date is not None:
+                            in_range &= timestamps >= start_date
+                        if end_date is not None:
+                            in_range &= timestamps <= end_date
+                        chunk = chunk[in_range]
+
+                    if not chunk.empty:
+                        yield chunk
 
         except FileNotFoundError:
             raise CommandError(f'Weather CSV file not found: {csv_file}')
-        except Exception as e:
+        except (pd.errors.ParserError, UnicodeDecodeError) as e:
             raise CommandError(f'Error reading weather CSV: {str(e)}')
 
     def validate_csv_structure(self, df: pd.DataFrame):
@@ -119,15 +255,7 @@ class Command(BaseCommand):
         if missing_columns:
             raise CommandError(f'Missing required columns: {missing_columns}')
 
-        # Check if we have any temperature or radiation columns
-        temp_columns = [col for col in df.columns if '_temperature' in col]
-        radiation_columns = [col for col in df.columns if '_radiation_' in col]
-
-        if not temp_columns and not radiation_columns:
-            raise CommandError('No temperature or radiation columns found in CSV')
-
         self.stdout.write(f'Weather CSV validation passed - {len(df.columns)} columns found')
-        self.stdout.write(f'Temperature columns: {len(temp_columns)}, Radiation columns: {len(radiation_columns)}')
 
     def parse_weather_columns(self, df: pd.DataFrame, countries_filter: str = None) -> Dict[str, Dict[str, str]]:
         """Parse column names to map weather variables by country"""
@@ -139,18 +267,17 @@ class Command(BaseCommand):
             self.stdout.write(f'Filtering for countries: {target_countries}')
 
         country_mapping = {}
+        variable_counts = {'temperature': 0, 'radiation_direct': 0, 'radiation_diffuse': 0}
 
+        # One pass over the header both checks for weather columns and maps them
         for column in df.columns:
-            if column == 'utc_timestamp':
-                continue
-
-            # Parse column pattern: COUNTRY_variable
-            parts = column.split('_', 1)
-            if len(parts) < 2:
+            match = WEATHER_COLUMN_PATTERN.match(column)
+            if not match:
                 continue
 
-            country_code = parts[0].upper()
-            variable = parts[1]
+            country_code = match.group('country').upper()
+            variable = WEATHER_VARIABLES[match.group('variable')]
+            variable_counts[variable] += 1
 
             # Filter by target countries if specified
             if target_countries and country_code not in target_countries:
@@ -164,13 +291,12 @@ class Command(BaseCommand):
                     'radiation_diffuse': None
                 }
 
-            # Map variables
-            if variable == 'temperature':
-                country_mapping[country_code]['temperature'] = column
-            elif variable == 'radiation_direct_horizontal':
-                country_mapping[country_code]['radiation_direct'] = column
-            elif variable == 'radiation_diffuse_horizontal':
-                country_mapping[country_code]['radiation_diffuse'] = column
+            country_mapping[country_code][variable] = column
+
+        radiation_count = variable_counts['radiation_direct'] + variable_counts['radiation_diffuse']
+        if not variable_counts['temperature'] and not radiation_count:
+            raise CommandError('No temperature or radiation columns found in CSV')
+        self.stdout.write(f'Temperature columns: {variable_counts["temperature"]}, Radiation columns: {radiation_count}')
 
         # Log what we found
         self.stdout.write(f'Found weather data for {len(country_mapping)} countries:')
@@ -180,8 +306,8 @@ class Command(BaseCommand):
 
         return country_mapping
 
-    def import_weather_data(self, df: pd.DataFrame, country_mapping: Dict[str, Dict[str, str]],
-                            batch_size: int, dry_run: bool) -> Dict[str, int]:
+    def import_weather_data(self, chunks: Iterable[pd.DataFrame], country_mapping: Dict[str, Dict[str, str]],
+                            batch_size: int, dry_run: bool, workers: int = 1) -> Dict[str, int]:
         """Import weather data into Django models"""
 
         stats = {
@@ -189,144 +315,205 @@ class Command(BaseCommand):
             'countries_processed': 0,
             'errors': 0
         }
-
-        total_rows = len(df)
-
-        for start_idx in range(0, total_rows, batch_size):
-            end_idx = min(start_idx + batch_size, total_rows)
-            batch_df = df.iloc[start_idx:end_idx]
-
-            self.stdout.write(f'Processing weather batch {start_idx}-{end_idx} of {total_rows}')
-
-            if not dry_run:
-                with transaction.atomic():
-                    batch_stats = self.process_weather_batch(batch_df, country_mapping)
+        self.date_range = [None, None]
+        countries = self.country_columns(country_mapping)
+
+        rows_seen = 0
+        # Batches only depend on their own rows, so other processes can build the next
+        # ones while this process writes inside the import's single transaction
+        use_pool = workers > 1 and not dry_run
+        with ProcessPoolExecutor(max_workers=workers) if use_pool else nullcontext() as executor:
+            for batch_df, built in self.prefetch_batches(chunks, countries, executor, workers):
+                start_idx, rows_seen = rows_seen, rows_seen + len(batch_df)
+                self.stdout.write(f'Processing weather batch {start_idx}-{rows_seen}')
+
+                batch_start, batch_end = batch_df['utc_timestamp'].min(), batch_df['utc_timestamp'].max()
+                if self.date_range[0] is None or batch_start < self.date_range[0]:
+                    self.date_range[0] = batch_start
+                if self.date_range[1] is None or batch_end > self.date_range[1]:
+                    self.date_range[1] = batch_end
+
+                if not dry_run:
+                    batch_stats = self.process_weather_batch(batch_df, countries, batch_size, built)
                     stats['weather_records'] += batch_stats['records']
                     stats['errors'] += batch_stats['errors']
-            else:
-                # Dry run - count what would be imported
-                batch_stats = self.count_weather_records(batch_df, country_mapping)
-                stats['weather_records'] += batch_stats['records']
+                else:
+                    # Dry run - count what would be imported
+                    batch_stats = self.count_weather_records(batch_df, countries)
+                    stats['weather_records'] += batch_stats['records']
 
+        self.stdout.write(f'Read {rows_seen} rows from weather CSV')
         stats['countries_processed'] = len(country_mapping)
         return stats
 
-    def process_weather_batch(self, df: pd.DataFrame, country_mapping: Dict[str, Dict[str, str]]) -> Dict[str, int]:
-        """Process a batch of weather data"""
-        weather_records = []
-        errors = 0
-
-        for _, row in df.iterrows():
-            timestamp = row['utc_timestamp']
-
-            for country_code, variables in country_mapping.items():
-                try:
-                    # Extract weather variables for this country
-                    temperature = None
-                    solar_irradiance = None
-
-                    # Get temperature
-                    if variables['temperature']:
-                        temp_val = row.get(variables['temperature'])
-                        if not pd.isna(temp_val):
-                            temperature = float(temp_val)
-
-                    # Calculate total solar irradiance (direct + diffuse)
-                    direct_rad = None
-                    diffuse_rad = None
-
-                    if variables['radiation_direct']:
-                        direct_val = row.get(variables['radiation_direct'])
-                        if not pd.isna(direct_val):
-                            direct_rad = float(direct_val)
-
-                    if variables['radiation_diffuse']:
-                        diffuse_val = row.get(variables['radiation_diffuse'])
-                        if not pd.isna(diffuse_val):
-                            diffuse_rad = float(diffuse_val)
-
-                    # Calculate total horizontal irradiance
-                    if direct_rad is not None and diffuse_rad is not None:
-                        solar_irradiance = direct_rad + diffuse_rad
-                    elif direct_rad is not None:
-                        solar_irradiance = direct_rad
-                    elif diffuse_rad is not None:
-                        solar_irradiance = diffuse_rad
-
-                    # Skip if no data available
-                    if temperature is None and solar_irradiance is None:
-                        continue
-
-                    # Create weather record
-                    weather_record = WeatherData(
-                        timestamp=timestamp,
-                        location=f"{country_code} Average",  # Country-level average
-                        country_code=country_code,
-                        temperature_celsius=temperature,
-                        solar_irradiance_wm2=solar_irradiance,
-                        # Store components in additional fields if your model supports them
-                        # You might want to add these to your WeatherData model:
-                        # radiation_direct_wm2=direct_rad,
-                        # radiation_diffuse_wm2=diffuse_rad,
-                    )
-                    weather_records.append(weather_record)
-
-                except Exception as e:
-                    errors += 1
-                    if errors <= 5:  # Log first few errors
-                        self.stdout.write(f'Error processing {country_code} at {timestamp}: {e}')
-
-        # Bulk create weather records
-        if weather_records:
-            try:
-                WeatherData.objects.bulk_create(
-                    weather_records,
-                    ignore_conflicts=True,
-                    batch_size=500
-                )
-            except Exception as e:
-                self.stdout.write(f'Bulk create error: {e}')
-                errors += len(weather_records)
-                return {'records': 0, 'errors': errors}
-
-        return {'records': len(weather_records), 'errors': errors}
-
-    def count_weather_records(self, df: pd.DataFrame, country_mapping: Dict[str, Dict[str, str]]) -> Dict[str, int]:
-        """Count weather records for dry run"""
-        record_count = 0
+    def prefetch_batches(self, chunks: Iterable[pd.DataFrame], countries: List[Tuple[str, ...]],
+                         executor, workers: int) -> Iterator[Tuple[pd.DataFrame, Future]]:
+        """Yield chunks in order, each with a future for its records when a process pool is in use"""
+        if executor is None:
+            for chunk in chunks:
+                yield chunk, None
+            return
+
+        # Keep a few batches in flight so workers stay busy without reading the whole file ahead
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(build_weather_records, chunk, countries)))
+            if len(pending) > workers:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+    def country_columns(self, country_mapping: Dict[str, Dict[str, str]]) -> List[Tuple[str, ...]]:
+        """Flatten the mapping into per-country (code, temperature, direct, diffuse) tuples"""
+        return [
+            (
+                country_code,
+                variables['temperature'],
+                variables['radiation_direct'],
+                variables['radiation_diffuse'],
+            )
+            for country_code, variables in country_mapping.items()
+        ]
 
-        for _, row in df.iterrows():
-            for country_code, variables in country_mapping.items():
-                # Count if any data is available for this country/timestamp
-                has_data = False
+    def process_weather_batch(self, df: pd.DataFrame, countries: List[Tuple[str, ...]],
+                              batch_size: int, built: Future = None) -> Dict[str, int]:
+        """Process a batch of weather data"""
+        records = None
 
-                if variables['temperature']:
-                    temp_val = row.get(variables['temperature'])
-                    if not pd.isna(temp_val):
-                        has_data = True
+        # Once the arrays are built nothing here fails per row, so a bad column
+        # or a failed insert fails the whole batch and is reported once
+        try:
+            records = built.result() if built is not None else build_weather_records(df, countries)
+            if records.empty:
+                return {'records': 0, 'errors': 0}
+
+            if connection.vendor == 'postgresql' and self.insert_method == 'values':
+                self._insert_values(records, batch_size)
+            elif connection.vendor == 'postgresql':
+                self._copy_records(records)
+            else:
+                # A savepoint, so a failed batch doesn't abort the import's transaction
+                with transaction.atomic():
+                    WeatherData.objects.bulk_create(
+                        self.build_instances(self.to_model_records(records)),
+                        ignore_conflicts=True,
+                        batch_size=batch_size
+                    )
+        except Exception as e:
+            self.stdout.write(f'Error processing weather batch: {e}')
+            # Count failures in per-country records, like the imported count, not in CSV rows
+            if records is None:
+                return {'records': 0, 'errors': self.count_weather_records(df, countries)['records']}
+            return {'records': 0, 'errors': len(records)}
+
+        return {'records': len(records), 'errors': 0}
+
+    def to_model_records(self, records: pd.DataFrame) -> List[dict]:
+        """Convert weather rows to field dicts, widening floats and turning NaN into None"""
+        # Same values COPY writes; a plain float64 cast would store 5.300000190734863 for 5.3
+        records = records.assign(
+            temperature_celsius=widen_float32(records['temperature_celsius']),
+            solar_irradiance_wm2=widen_float32(records['solar_irradiance_wm2']),
+        )
+        return records.astype(object).where(records.notna(), None).to_dict('records')
+
+    def build_instances(self, records: List[dict]) -> List[WeatherData]:
+        """Build unsaved WeatherData instances without running Model.__init__ for every row"""
+        if not records:
+            return []
+
+        # The regular constructor checks the field names once and supplies the defaults
+        template = WeatherData(**records[0])
+        defaults = {key: value for key, value in template.__dict__.items() if key != '_state'}
+
+        instances = [None] * len(records)
+        for i, record in enumerate(records):
+            instance = WeatherData.__new__(WeatherData)
+            instance.__dict__.update(defaults)
+            instance.__dict__.update(record)
+            instance._state = ModelState()
+            instances[i] = instance
+        return instances
+
+    def _insert_values(self, records: pd.DataFrame, page_size: int):
+        """Insert rows with multi-row INSERT ... VALUES statements and ON CONFLICT DO NOTHING"""
+        opts = WeatherData._meta
+        qn = connection.ops.quote_name
+
+        def column_list(names):
+            return ', '.join(qn(opts.get_field(name).column) for name in names)
+
+        # created_at is auto_now_add, which raw SQL bypasses, so it is supplied here
+        records = records.assign(created_at=timezone.now())
+        template = '(' + ', '.join(f'%({name})s' for name in records.columns) + ')'
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            execute_values(
+                cursor.cursor,
+                f'INSERT INTO {qn(opts.db_table)} ({column_list(records.columns)}) VALUES %s '
+                f'ON CONFLICT ({column_list(opts.unique_together[0])}) DO NOTHING',
+                self.to_model_records(records),
+                template=template,
+                page_size=page_size
+            )
 
-                if variables['radiation_direct']:
-                    rad_val = row.get(variables['radiation_direct'])
-                    if not pd.isna(rad_val):
-                        has_data = True
+    def _copy_records(self, records: pd.DataFrame):
+        """COPY rows into a temp staging table, then insert them with ON CONFLICT DO NOTHING"""
+        opts = WeatherData._meta
+        qn = connection.ops.quote_name
+
+        def column_list(names):
+            return ', '.join(qn(opts.get_field(name).column) for name in names)
+
+        table = qn(opts.db_table)
+        staging = qn(f'_stg_{opts.model_name}')
+        # created_at is auto_now_add, which COPY bypasses, so it is supplied here
+        records = records.assign(created_at=timezone.now())
+        columns = column_list(records.columns)
+
+        # Arrow's native CSV writer formats the numeric and timestamp columns without
+        # a Python call per value, which is what to_csv spends most of its time on
+        buffer = io.BytesIO()
+        pa_csv.write_csv(
+            pa.Table.from_pandas(records, preserve_index=False), buffer,
+            write_options=pa_csv.WriteOptions(include_header=False)
+        )
+        buffer.seek(0)
+
+        # Temp tables are never WAL-logged. The import runs as one transaction, so the
+        # staging table is dropped per batch rather than left for ON COMMIT.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE {staging} ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {table} WITH NO DATA'
+            )
+            cursor.copy_expert(f'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) '
+                f'SELECT {columns} FROM {staging} '
+                f'ON CONFLICT ({column_list(opts.unique_together[0])}) DO NOTHING'
+            )
+            cursor.execute(f'DROP TABLE {staging}')
 
-                if variables['radiation_diffuse']:
-                    rad_val = row.get(variables['radiation_diffuse'])
-                    if not pd.isna(rad_val):
-                        has_data = True
+    def count_weather_records(self, df: pd.DataFrame, countries: List[Tuple[str, ...]]) -> Dict[str, int]:
+        """Count the weather records a batch would import, for dry runs and failed batches"""
+        record_count = 0
 
-                if has_data:
-                    record_count += 1
+        for _, *variable_columns in countries:
+            columns = [column for column in variable_columns if column]
+            if columns:
+                # Rows where any of this country's variables has data
+                record_count += int(df[columns].notna().any(axis=1).sum())
 
         return {'records': record_count}
 
-    def log_import_results(self, csv_file: str, df: pd.DataFrame, stats: Dict[str, int]):
+    def log_import_results(self, csv_file: str, stats: Dict[str, int]):
         """Log import results"""
         # You could create a WeatherImportLog model similar to DataImportLog
         # For now, just log to console
         self.stdout.write(f'Weather import completed:')
         self.stdout.write(f'  File: {csv_file}')
-        self.stdout.write(f'  Date range: {df["utc_timestamp"].min()} to {df["utc_timestamp"].max()}')
+        self.stdout.write(f'  Date range: {self.date_range[0]} to {self.date_range[1]}')
         self.stdout.write(f'  Countries processed: {stats["countries_processed"]}')
         self.stdout.write(f'  Records imported: {stats["weather_records"]}')
         self.stdout.write(f'  Errors: {stats["errors"]}')
@@ -0,0 +1,50 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+# 0003-0007 rebuilt the timestamp index three times on the way to the final
+# (-timestamp, country_code) index; databases that haven't applied any of them
+# go straight to the final indexes, each built once and without blocking writes
+class Migration(migrations.Migration):
+    atomic = False
+
+    replaces = [
+        ('weather', '0003_weatherdata_weather_wea_timesta_f3f1a0_idx'),
+        ('weather', '0004_remove_weatherdata_weather_wea_timesta_f3f1a0_idx_and_more'),
+        ('weather', '0005_alter_weatherdata_timestamp_and_more'),
+        ('weather', '0006_remove_weatherdata_weather_wea_country_79aa9b_idx_and_more'),
+        ('weather', '0007_remove_weatherdata_weather_wea_timesta_3c87e2_idx_and_more'),
+    ]
+
+    dependencies = [
+        ('weather', '0002_weatherdata_radiation_diffuse_wm2_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='weatherdata',
+            name='timestamp',
+            field=models.DateTimeField(),
+        ),
+        RemoveIndexConcurrently(
+            model_name='weatherdata',
+            name='weather_wea_country_79aa9b_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='weatherdata',
+            unique_together={('country_code', 'timestamp')},
+        ),
+        migrations.RemoveField(
+            model_name='weatherdata',
+            name='location',
+        ),
+        AddIndexConcurrently(
+            model_name='weatherdata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='weatherdata_ts_brin', pages_per_range=32),
+        ),
+        AddIndexConcurrently(
+            model_name='weatherdata',
+            index=models.Index(fields=['-timestamp', 'country_code'], name='weather_wea_timesta_0e11b5_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0002_weatherdata_radiation_diffuse_wm2_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['timestamp', 'country_code'], name='weather_wea_timesta_f3f1a0_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:04
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('weather', '0003_weatherdata_weather_wea_timesta_f3f1a0_idx'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='weatherdata',
+            name='weather_wea_timesta_f3f1a0_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='weatherdata',
+            index=models.Index(fields=['-timestamp', 'country_code', 'location'], name='weather_wea_timesta_3c87e2_idx'),
+        ),
+    ]
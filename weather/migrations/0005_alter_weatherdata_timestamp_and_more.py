@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:11
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_remove_weatherdata_weather_wea_timesta_f3f1a0_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='weatherdata',
+            name='timestamp',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='weatherdata_ts_brin', pages_per_range=32),
+        ),
+    ]
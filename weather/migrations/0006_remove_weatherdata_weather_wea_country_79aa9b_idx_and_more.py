@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0005_alter_weatherdata_timestamp_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='weatherdata',
+            name='weather_wea_country_79aa9b_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='weatherdata',
+            unique_together={('country_code', 'timestamp')},
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('weather', '0006_remove_weatherdata_weather_wea_country_79aa9b_idx_and_more'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='weatherdata',
+            name='weather_wea_timesta_3c87e2_idx',
+        ),
+        migrations.RemoveField(
+            model_name='weatherdata',
+            name='location',
+        ),
+        AddIndexConcurrently(
+            model_name='weatherdata',
+            index=models.Index(fields=['-timestamp', 'country_code'], name='weather_wea_timesta_0e11b5_idx'),
+        ),
+    ]
@@ -1,12 +1,31 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 
 # Create your models here.
 
+WEATHER_VARIABLE_FIELDS = [
+    'temperature_celsius', 'temperature_min_celsius', 'temperature_max_celsius',
+    'humidity_percent', 'wind_speed_ms', 'wind_direction_degrees', 'cloud_cover_percent',
+    'precipitation_mm', 'solar_irradiance_wm2', 'pressure_hpa',
+    'radiation_direct_wm2', 'radiation_diffuse_wm2',
+]
+
+
+class WeatherDataManager(models.Manager):
+    def bulk_upsert(self, objs, batch_size=1000):
+        """Insert observations in multi-row batches, overwriting values already stored for a country and time"""
+        return self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['country_code', 'timestamp'],
+            update_fields=WEATHER_VARIABLE_FIELDS
+        )
+
 
 class WeatherData(models.Model):
     """Weather data for forecasting"""
-    timestamp = models.DateTimeField(db_index=True)
-    location = models.CharField(max_length=100)
+    timestamp = models.DateTimeField()
     country_code = models.CharField(max_length=10, db_index=True)
 
     # Core weather variables
@@ -23,6 +42,11 @@ class WeatherData(models.Model):
     radiation_direct_wm2 = models.FloatField(null=True, blank=True)
     radiation_diffuse_wm2 = models.FloatField(null=True, blank=True)
 
+    @property
+    def location(self):
+        '''Country-level average series; derived rather than stored on every row'''
+        return f"{self.country_code} Average"
+
     @property
     def total_horizontal_irradiance(self):
         '''Calculate total horizontal irradiance from components'''
@@ -32,10 +56,14 @@ class WeatherData(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = WeatherDataManager()
+
     class Meta:
-        unique_together = ['country_code', 'location', 'timestamp']
+        # The unique index also serves the (country_code, timestamp) lookups
+        unique_together = ['country_code', 'timestamp']
         indexes = [
-            models.Index(fields=['country_code', 'timestamp']),
+            models.Index(fields=['-timestamp', 'country_code']),
+            BrinIndex(fields=['timestamp'], pages_per_range=32, name='weatherdata_ts_brin'),
         ]
 
 
@@ -1,3 +1,112 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from weather.models import WeatherData
+
+WEATHER_CSV = """\
+utc_timestamp,DE_temperature,DE_radiation_direct_horizontal,DE_radiation_diffuse_horizontal,FR_temperature
+2019-01-01T00:00:00Z,5.3,0,0,7.1
+2019-01-01T01:00:00Z,4.9,,,
+2019-01-01T02:00:00Z,,12.5,3.25,6.8
+"""
+
+
+class WeatherImportMixin:
+    def import_csv(self, *args, content=WEATHER_CSV):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+
+        out = StringIO()
+        call_command('import_weather_data', path, *args, stdout=out)
+        return out.getvalue()
+
+
+class ImportWeatherDataTests(WeatherImportMixin, TestCase):
+    def stored_rows(self):
+        return list(WeatherData.objects.order_by('timestamp', 'country_code').values_list(
+            'timestamp', 'country_code', 'temperature_celsius', 'solar_irradiance_wm2'
+        ))
+
+    def test_copy_stores_values_as_written(self):
+        self.import_csv()
+
+        first_hour = datetime(2019, 1, 1, tzinfo=dt_timezone.utc)
+        third_hour = datetime(2019, 1, 1, 2, tzinfo=dt_timezone.utc)
+        self.assertEqual(self.stored_rows(), [
+            (first_hour, 'DE', 5.3, 0.0),
+            (first_hour, 'FR', 7.1, None),
+            (datetime(2019, 1, 1, 1, tzinfo=dt_timezone.utc), 'DE', 4.9, None),
+            (third_hour, 'DE', None, 15.75),
+            (third_hour, 'FR', 6.8, None),
+        ])
+
+    def test_insert_methods_store_identical_values(self):
+        self.import_csv('--insert-method', 'copy')
+        copied = self.stored_rows()
+        WeatherData.objects.all().delete()
+
+        self.import_csv('--insert-method', 'values')
+
+        self.assertEqual(self.stored_rows(), copied)
+
+    def test_existing_rows_are_kept(self):
+        self.import_csv()
+        self.import_csv(content=WEATHER_CSV.replace(',5.3,', ',9.9,'))
+
+        self.assertEqual(WeatherData.objects.count(), 5)
+        self.assertEqual(WeatherData.objects.get(country_code='DE', temperature_celsius=5.3).timestamp,
+                         datetime(2019, 1, 1, tzinfo=dt_timezone.utc))
+
+    def test_dry_run_counts_without_writing(self):
+        output = self.import_csv('--dry-run')
+
+        self.assertIn("'weather_records': 5", output)
+        self.assertFalse(WeatherData.objects.exists())
+
+    @mock.patch(
+        'weather.management.commands.import_weather_data.build_weather_records',
+        side_effect=ValueError('bad column')
+    )
+    def test_failed_batch_is_counted_in_records(self, build_weather_records):
+        output = self.import_csv()
+
+        self.assertIn("'weather_records': 0, 'countries_processed': 2, 'errors': 5", output)
+
+    def test_unused_text_columns_are_read_without_failing(self):
+        lines = WEATHER_CSV.splitlines()
+        content = '\n'.join([lines[0] + ',comment'] + [line + ',see log' for line in lines[1:]]) + '\n'
+
+        self.import_csv(content=content)
+
+        self.assertEqual(WeatherData.objects.count(), 5)
+
+    def test_countries_filter(self):
+        self.import_csv('--countries', 'fr')
+
+        self.assertEqual(set(WeatherData.objects.values_list('country_code', flat=True)), {'FR'})
+
+
+# Indexes are rebuilt CONCURRENTLY, which can't run inside a test transaction
+class ImportWeatherDataIndexTests(WeatherImportMixin, TransactionTestCase):
+    def test_disable_indexes_rebuilds_valid_indexes(self):
+        self.import_csv('--disable-indexes')
+
+        self.assertEqual(WeatherData.objects.count(), 5)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = %s::regclass",
+                [WeatherData._meta.db_table]
+            )
+            indexes = dict(cursor.fetchall())
+        for index in WeatherData._meta.indexes:
+            self.assertIs(indexes.get(index.name), True)